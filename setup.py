@@ -23,6 +23,9 @@ setup(
         "pillow",
         "graphviz",
     ],
+    extras_require={
+        "analysis": ["numpy"],
+    },
     license="GPLv3",
     keywords="cable connector hardware harness wiring wiring-diagram wiring-harness",
     url=APP_URL,
@@ -31,7 +34,7 @@ setup(
     packages=find_packages("src"),
     entry_points={
         "console_scripts": [
-            "wireviz=wireviz.wv_cli:wireviz",
+            "wireviz=wireviz.wv_cli:cli",
         ],
     },
     classifiers=[
@@ -58,8 +58,15 @@ class Options:
     color_mode: ColorMode = "SHORT"
     mini_bom_mode: bool = True
     template_separator: str = "."
+    parallel_layout: bool = False
+    sheet_size: Optional[int] = None
+    wire_render: str = "full"
+    bom_mass: bool = False
+    analysis_current: float = 1.0
 
     def __post_init__(self):
+        if self.wire_render not in ("full", "compact"):
+            raise Exception(f"Unknown wire_render option: {self.wire_render}")
         if not self.bgcolor_node:
             self.bgcolor_node = self.bgcolor
         if not self.bgcolor_connector:
@@ -160,8 +167,10 @@ class Connector:
     show_name: Optional[bool] = None
     show_pincount: Optional[bool] = None
     hide_disconnected_pins: bool = False
+    collapse_disconnected_pins: bool = False
     loops: List[List[Pin]] = field(default_factory=list)
     ignore_in_bom: bool = False
+    sheet: Union[int, str, None] = None
     additional_components: List[AdditionalComponent] = field(default_factory=list)
 
     def __post_init__(self) -> None:
@@ -271,6 +280,7 @@ class Cable:
     show_wirecount: bool = True
     show_wirenumbers: Optional[bool] = None
     ignore_in_bom: bool = False
+    sheet: Union[int, str, None] = None
     additional_components: List[AdditionalComponent] = field(default_factory=list)
 
     def __post_init__(self) -> None:
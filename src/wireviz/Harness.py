@@ -1,21 +1,22 @@
 # -*- coding: utf-8 -*-
 
 import re
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass
 from itertools import zip_longest
 from pathlib import Path
-from typing import Any, List, Union
+from typing import TYPE_CHECKING, Any, Collection, Dict, List, Optional, Tuple, Union
 
-from graphviz import Graph
 from wireviz import APP_NAME, APP_URL, __version__, wv_colors
 from wireviz.DataClasses import (
     Cable,
+    Connection,
     Connector,
     MateComponent,
     MatePin,
     Metadata,
     Options,
+    Pin,
     Side,
     Tweak,
 )
@@ -29,8 +30,12 @@ from wireviz.wv_bom import (
     generate_bom,
     get_additional_component_table,
     pn_info_string,
+    write_bom_csv,
+    write_bom_jsonl,
+    write_bom_tsv,
 )
 from wireviz.wv_colors import get_color_hex, translate_color
+from wireviz.wv_connections import CompiledConnectionSet, ComponentKind
 from wireviz.wv_gv_html import (
     html_bgcolor,
     html_bgcolor_attr,
@@ -47,7 +52,7 @@ from wireviz.wv_helper import (
     flatten2d,
     is_arrow,
     mm2_equiv,
-    tuplelist2tsv,
+    open_file_write,
 )
 from wireviz.wv_html import generate_html_output
 
@@ -57,6 +62,9 @@ OLD_CONNECTOR_ATTR = {
     "autogenerate": "is replaced with new syntax in v0.4",
 }
 
+if TYPE_CHECKING:
+    from graphviz import Graph
+
 
 def check_old(node: str, old_attr: dict, args: dict) -> None:
     """Raise exception for any outdated attributes in args."""
@@ -76,6 +84,7 @@ class Harness:
         self.cables = {}
         self.mates = []
         self._bom = []  # Internal Cache for generated bom
+        self._index_cache = {}  # Internal Cache of pin and wire indices
         self.additional_bom_items = []
 
     def add_connector(self, name: str, *args, **kwargs) -> None:
@@ -106,53 +115,14 @@ class Harness:
         to_pin: (int, str),
     ) -> None:
         # check from and to connectors
-        for name, pin in zip([from_name, to_name], [from_pin, to_pin]):
-            if name is not None and name in self.connectors:
-                connector = self.connectors[name]
-                # check if provided name is ambiguous
-                if pin in connector.pins and pin in connector.pinlabels:
-                    if connector.pins.index(pin) != connector.pinlabels.index(pin):
-                        raise Exception(
-                            f"{name}:{pin} is defined both in pinlabels and pins, for different pins."
-                        )
-                    # TODO: Maybe issue a warning if present in both lists but referencing the same pin?
-                if pin in connector.pinlabels:
-                    if connector.pinlabels.count(pin) > 1:
-                        raise Exception(f"{name}:{pin} is defined more than once.")
-                    index = connector.pinlabels.index(pin)
-                    pin = connector.pins[index]  # map pin name to pin number
-                    if name == from_name:
-                        from_pin = pin
-                    if name == to_name:
-                        to_pin = pin
-                if not pin in connector.pins:
-                    raise Exception(f"{name}:{pin} not found.")
+        if from_name is not None and from_name in self.connectors:
+            from_pin = self._resolve_pin(from_name, from_pin)
+        if to_name is not None and to_name in self.connectors:
+            to_pin = self._resolve_pin(to_name, to_pin)
 
         # check via cable
         if via_name in self.cables:
-            cable = self.cables[via_name]
-            # check if provided name is ambiguous
-            if via_wire in cable.colors and via_wire in cable.wirelabels:
-                if cable.colors.index(via_wire) != cable.wirelabels.index(via_wire):
-                    raise Exception(
-                        f"{via_name}:{via_wire} is defined both in colors and wirelabels, for different wires."
-                    )
-                # TODO: Maybe issue a warning if present in both lists but referencing the same wire?
-            if via_wire in cable.colors:
-                if cable.colors.count(via_wire) > 1:
-                    raise Exception(
-                        f"{via_name}:{via_wire} is used for more than one wire."
-                    )
-                # list index starts at 0, wire IDs start at 1
-                via_wire = cable.colors.index(via_wire) + 1
-            elif via_wire in cable.wirelabels:
-                if cable.wirelabels.count(via_wire) > 1:
-                    raise Exception(
-                        f"{via_name}:{via_wire} is used for more than one wire."
-                    )
-                via_wire = (
-                    cable.wirelabels.index(via_wire) + 1
-                )  # list index starts at 0, wire IDs start at 1
+            via_wire = self._resolve_wire(via_name, via_wire)
 
         # perform the actual connection
         self.cables[via_name].connect(from_name, from_pin, via_wire, to_name, to_pin)
@@ -161,7 +131,190 @@ class Harness:
         if to_name in self.connectors:
             self.connectors[to_name].activate_pin(to_pin, Side.LEFT)
 
-    def create_graph(self) -> Graph:
+    def connect_set(self, connection_set: CompiledConnectionSet) -> None:
+        """Make all connections and mates of a compiled connection set.
+
+        All components referenced by the set must already have been added.
+        """
+        names = connection_set.designators
+        kinds = connection_set.kinds
+        columns = connection_set.columns
+        last = len(columns) - 1
+        # iterate instead of indexing, since pin lists may be lazy ranges
+        rows = zip(
+            range(connection_set.count),
+            zip(*(column.ids for column in columns)),
+            zip(*(column.pins for column in columns)),
+        )
+        for row, ids, pins in rows:
+            for index, id in enumerate(ids):
+                kind = kinds[id]
+                if kind is ComponentKind.CONNECTOR:
+                    continue
+                designator = names[id]
+                from_name = names[ids[index - 1]] if index > 0 else None
+                to_name = names[ids[index + 1]] if index < last else None
+
+                if kind is ComponentKind.CABLE:
+                    # a list may start or end with a cable,
+                    # with no connector to join on that side
+                    from_pin = to_pin = None
+                    if from_name is not None:
+                        from_pin = self._resolve_pin(from_name, pins[index - 1])
+                    if to_name is not None:
+                        to_pin = self._resolve_pin(to_name, pins[index + 1])
+                    via_wire = self._resolve_wire(designator, pins[index])
+                    self.cables[designator].connections.append(
+                        Connection(from_name, from_pin, via_wire, to_name, to_pin)
+                    )
+                    if from_name is not None:
+                        self.connectors[from_name].activate_pin(from_pin, Side.RIGHT)
+                    if to_name is not None:
+                        self.connectors[to_name].activate_pin(to_pin, Side.LEFT)
+                elif "-" in designator:  # mate pin by pin
+                    from_pin = pins[index - 1]
+                    to_pin = pins[index + 1]
+                    self.add_mate_pin(from_name, from_pin, to_name, to_pin, designator)
+                elif "=" in designator and row == 0:
+                    # mate two connectors as a whole
+                    self.add_mate_component(from_name, to_name, designator)
+
+    @staticmethod
+    def _collapsed_pin_ranges(connector: Connector) -> Dict[int, int]:
+        """Return first and last index of each run of disconnected pins to collapse."""
+        if not connector.collapse_disconnected_pins:
+            return {}
+        ranges = {}
+        start = None
+        # the appended None ends a run at the last pin
+        for index, pin in enumerate([*connector.pins, None]):
+            if pin is not None and not connector.visible_pins.get(pin, False):
+                if start is None:
+                    start = index
+            elif start is not None:
+                if index - start > 1:  # a single pin is shown as usual
+                    ranges[start] = index - 1
+                start = None
+        return ranges
+
+    def _pin_indices(self, name: str) -> Tuple[Dict, Dict]:
+        """Return dicts mapping pins to index, and pin labels to list of indices."""
+        indices = self._index_cache.get(("pins", name))
+        if indices is None:
+            connector = self.connectors[name]
+            pins = {pin: i for i, pin in enumerate(connector.pins)}
+            labels = {}
+            for i, label in enumerate(connector.pinlabels):
+                labels.setdefault(label, []).append(i)
+            indices = self._index_cache[("pins", name)] = (pins, labels)
+        return indices
+
+    def _wire_indices(self, name: str) -> Tuple[Dict, Dict]:
+        """Return dicts mapping wire colors and wire labels to lists of indices."""
+        indices = self._index_cache.get(("wires", name))
+        if indices is None:
+            cable = self.cables[name]
+            colors, labels = {}, {}
+            for i, color in enumerate(cable.colors):
+                colors.setdefault(color, []).append(i)
+            for i, label in enumerate(cable.wirelabels):
+                labels.setdefault(label, []).append(i)
+            indices = self._index_cache[("wires", name)] = (colors, labels)
+        return indices
+
+    def _resolve_pin(self, name: str, pin: (int, str)) -> (int, str):
+        """Return pin number of pin (number or label), or raise exception if invalid."""
+        pins, labels = self._pin_indices(name)
+        label_indices = labels.get(pin)
+        if label_indices:
+            # check if provided name is ambiguous
+            if pin in pins:
+                if pins[pin] != label_indices[0]:
+                    raise Exception(
+                        f"{name}:{pin} is defined both in pinlabels and pins, for different pins."
+                    )
+                # TODO: Maybe issue a warning if present in both lists but referencing the same pin?
+            if len(label_indices) > 1:
+                raise Exception(f"{name}:{pin} is defined more than once.")
+            # map pin name to pin number
+            pin = self.connectors[name].pins[label_indices[0]]
+        if not pin in pins:
+            raise Exception(f"{name}:{pin} not found.")
+        return pin
+
+    def _resolve_wire(self, name: str, wire: (int, str)) -> (int, str):
+        """Return wire number of wire (number, color or label), or raise exception if ambiguous."""
+        colors, labels = self._wire_indices(name)
+        color_indices = colors.get(wire)
+        label_indices = labels.get(wire)
+        # check if provided name is ambiguous
+        if color_indices and label_indices:
+            if color_indices[0] != label_indices[0]:
+                raise Exception(
+                    f"{name}:{wire} is defined both in colors and wirelabels, for different wires."
+                )
+            # TODO: Maybe issue a warning if present in both lists but referencing the same wire?
+        indices = color_indices or label_indices
+        if indices:
+            if len(indices) > 1:
+                raise Exception(f"{name}:{wire} is used for more than one wire.")
+            wire = indices[0] + 1  # list index starts at 0, wire IDs start at 1
+        return wire
+
+    def connected_components(self) -> List[List[str]]:
+        """Return groups of connectors and cables joined by connections or mates.
+
+        Each group lists its designators in the order of the harness.
+        """
+        parent = {name: name for name in [*self.connectors, *self.cables]}
+
+        def find(name: str) -> str:
+            while parent[name] != name:
+                parent[name] = parent[parent[name]]  # path halving
+                name = parent[name]
+            return name
+
+        def union(a: str, b: str) -> None:
+            parent[find(a)] = find(b)
+
+        for cable in self.cables.values():
+            for connection in cable.connections:
+                if connection.from_name is not None:
+                    union(cable.name, connection.from_name)
+                if connection.to_name is not None:
+                    union(cable.name, connection.to_name)
+        for mate in self.mates:
+            union(mate.from_name, mate.to_name)
+
+        groups = {}
+        for name in parent:
+            groups.setdefault(find(name), []).append(name)
+        return list(groups.values())
+
+    def create_graph(
+        self,
+        designators: Optional[Collection[str]] = None,
+        references: Optional[Dict[str, str]] = None,
+    ) -> "Graph":
+        """Return the graph of the harness, or of the given components only.
+
+        Components in references are not part of the graph, but connections
+        and mates to them end at a reference node showing the given text.
+        """
+        from graphviz import Graph  # Only needed when rendering
+
+        def included(name: str) -> bool:
+            return designators is None or name in designators
+
+        referenced = {}  # components shown as reference nodes, in order
+
+        def reference(name: str) -> bool:
+            """Return True if name is shown as a reference node."""
+            if included(name) or not references or name not in references:
+                return False
+            referenced[name] = None
+            return True
+
         dot = Graph()
         dot.body.append(f"// Graph generated by {APP_NAME} {__version__}\n")
         dot.body.append(f"// {APP_URL}\n")
@@ -186,6 +339,8 @@ class Harness:
         dot.attr("edge", style="bold", fontname=self.options.fontname)
 
         for connector in self.connectors.values():
+            if not included(connector.name):
+                continue
             # If no wires connected (except maybe loop wires)?
             if not (connector.ports_left or connector.ports_right):
                 connector.ports_left = True  # Use left side pins.
@@ -217,16 +372,33 @@ class Harness:
                     '<table border="0" cellspacing="0" cellpadding="3" cellborder="1">'
                 )
 
+                collapsed = self._collapsed_pin_ranges(connector)
+                collapsed_until = -1
                 for pinindex, (pinname, pinlabel, pincolor) in enumerate(
                     zip_longest(
                         connector.pins, connector.pinlabels, connector.pincolors
                     )
                 ):
+                    if pinindex <= collapsed_until:
+                        continue
                     if (
                         connector.hide_disconnected_pins
                         and not connector.visible_pins.get(pinname, False)
                     ):
                         continue
+                    if pinindex in collapsed:  # one summary row for the range
+                        collapsed_until = collapsed[pinindex]
+                        colspan = (
+                            connector.ports_left
+                            + bool(any(connector.pinlabels))
+                            + 2 * bool(connector.pincolors)
+                            + connector.ports_right
+                        )
+                        summary = f"{pinname} &#8230; {connector.pins[collapsed_until]}"
+                        # fmt: off
+                        pinhtml.append(f'   <tr><td colspan="{colspan}">{summary} (not connected)</td></tr>')
+                        # fmt: on
+                        continue
 
                     pinhtml.append("   <tr>")
                     if connector.ports_left:
@@ -294,7 +466,48 @@ class Harness:
             for colorstr in cable.colors
         )
 
+        def wire_color(cable: Cable, via_port: Union[int, str]) -> str:
+            if isinstance(
+                via_port, int
+            ):  # check if it's an actual wire and not a shield
+                return ":".join(
+                    ["#000000"]
+                    + wv_colors.get_color_hex(cable.colors[via_port - 1], pad=pad)
+                    + ["#000000"]
+                )
+            # it's a shield connection
+            # shield is shown with specified color and black borders, or as a thin black wire otherwise
+            elif isinstance(cable.shield, str):
+                shield_color_hex = wv_colors.get_color_hex(cable.shield)[0]
+                return ":".join(["#000000", shield_color_hex, "#000000"])
+            else:
+                return "#000000"
+
+        def port_str(name: str, pin: Pin, side: str) -> str:
+            if self.connectors[name].style == "simple" or not included(name):
+                return ""
+            return f":p{self._pin_indices(name)[0][pin] + 1}{side}"
+
+        # draw wires with fewer table cells, to speed up layout of large cables
+        compact = self.options.wire_render == "compact"
+
         for cable in self.cables.values():
+            if not included(cable.name):
+                # draw the wires of an off-sheet cable up to its reference node
+                for connection in cable.connections:
+                    from_name, to_name = connection.from_name, connection.to_name
+                    from_shown = from_name is not None and included(from_name)
+                    to_shown = to_name is not None and included(to_name)
+                    if not (from_shown or to_shown) or not reference(cable.name):
+                        continue
+                    dot.attr("edge", color=wire_color(cable, connection.via_port))
+                    if from_shown:
+                        from_port = port_str(from_name, connection.from_pin, "r")
+                        dot.edge(f"{from_name}{from_port}:e", f"{cable.name}:w")
+                    if to_shown:
+                        to_port = port_str(to_name, connection.to_pin, "l")
+                        dot.edge(f"{cable.name}:e", f"{to_name}{to_port}:w")
+                continue
             html = []
 
             awg_fmt = ""
@@ -302,10 +515,10 @@ class Harness:
                 # Only convert units we actually know about, i.e. currently
                 # mm2 and awg --- other units _are_ technically allowed,
                 # and passed through as-is.
-                if cable.gauge_unit == "mm\u00B2":
+                if cable.gauge_unit == "mm\u00b2":
                     awg_fmt = f" ({awg_equiv(cable.gauge)} AWG)"
                 elif cable.gauge_unit.upper() == "AWG":
-                    awg_fmt = f" ({mm2_equiv(cable.gauge)} mm\u00B2)"
+                    awg_fmt = f" ({mm2_equiv(cable.gauge)} mm\u00b2)"
 
             # fmt: off
             rows = [[f'{html_bgcolor(cable.bgcolor_title)}{remove_links(cable.name)}'
@@ -337,7 +550,8 @@ class Harness:
             wirehtml = []
             # conductor table
             wirehtml.append('<table border="0" cellspacing="0" cellborder="0">')
-            wirehtml.append("   <tr><td>&nbsp;</td></tr>")
+            if not compact:
+                wirehtml.append("   <tr><td>&nbsp;</td></tr>")
 
             for i, (connection_color, wirelabel) in enumerate(
                 zip_longest(cable.colors, cable.wirelabels), 1
@@ -365,12 +579,18 @@ class Harness:
                 # fmt: off
                 bgcolors = ['#000000'] + get_color_hex(connection_color, pad=pad) + ['#000000']
                 wirehtml.append(f"   <tr>")
-                wirehtml.append(f'    <td colspan="3" border="0" cellspacing="0" cellpadding="0" port="w{i}" height="{(2 * len(bgcolors))}">')
-                wirehtml.append('     <table cellspacing="0" cellborder="0" border="0">')
-                for j, bgcolor in enumerate(bgcolors[::-1]):  # Reverse to match the curved wires when more than 2 colors
-                    wirehtml.append(f'      <tr><td colspan="3" cellpadding="0" height="2" bgcolor="{bgcolor if bgcolor != "" else wv_colors.default_color}" border="0"></td></tr>')
-                wirehtml.append("     </table>")
-                wirehtml.append("    </td>")
+                if compact:  # one cell per wire, with black border and up to two colors
+                    stripes = list(dict.fromkeys(bgcolors[1:-1]))[:2]
+                    # a weighted color list splits the cell into two sharp stripes instead of a gradient
+                    fill = f'bgcolor="{stripes[0]};0.5:{stripes[1]}" gradientangle="90"' if len(stripes) > 1 else f'bgcolor="{stripes[0]}"'
+                    wirehtml.append(f'    <td colspan="3" border="1" sides="tb" cellpadding="0" port="w{i}" height="{(2 * len(bgcolors))}" {fill}></td>')
+                else:
+                    wirehtml.append(f'    <td colspan="3" border="0" cellspacing="0" cellpadding="0" port="w{i}" height="{(2 * len(bgcolors))}">')
+                    wirehtml.append('     <table cellspacing="0" cellborder="0" border="0">')
+                    for j, bgcolor in enumerate(bgcolors[::-1]):  # Reverse to match the curved wires when more than 2 colors
+                        wirehtml.append(f'      <tr><td colspan="3" cellpadding="0" height="2" bgcolor="{bgcolor if bgcolor != "" else wv_colors.default_color}" border="0"></td></tr>')
+                    wirehtml.append("     </table>")
+                    wirehtml.append("    </td>")
                 wirehtml.append("   </tr>")
                 # fmt: on
 
@@ -418,7 +638,8 @@ class Harness:
                         # fmt: on
 
             if cable.shield:
-                wirehtml.append("   <tr><td>&nbsp;</td></tr>")  # spacer
+                if not compact:
+                    wirehtml.append("   <tr><td>&nbsp;</td></tr>")  # spacer
                 wirehtml.append("   <tr>")
                 wirehtml.append("    <td><!-- s_in --></td>")
                 wirehtml.append("    <td>Shield</td>")
@@ -437,7 +658,8 @@ class Harness:
                 wirehtml.append(f'   <tr><td colspan="3" cellpadding="0" {attributes} port="ws"></td></tr>')
                 # fmt: on
 
-            wirehtml.append("   <tr><td>&nbsp;</td></tr>")
+            if not compact:
+                wirehtml.append("   <tr><td>&nbsp;</td></tr>")
             wirehtml.append("  </table>")
 
             html = [
@@ -446,35 +668,13 @@ class Harness:
 
             # connections
             for connection in cable.connections:
-                if isinstance(connection.via_port, int):
-                    # check if it's an actual wire and not a shield
-                    dot.attr(
-                        "edge",
-                        color=":".join(
-                            ["#000000"]
-                            + wv_colors.get_color_hex(
-                                cable.colors[connection.via_port - 1], pad=pad
-                            )
-                            + ["#000000"]
-                        ),
-                    )
-                else:  # it's a shield connection
-                    # shield is shown with specified color and black borders, or as a thin black wire otherwise
-                    dot.attr(
-                        "edge",
-                        color=(
-                            ":".join(["#000000", shield_color_hex, "#000000"])
-                            if isinstance(cable.shield, str)
-                            else "#000000"
-                        ),
-                    )
+                dot.attr("edge", color=wire_color(cable, connection.via_port))
                 if connection.from_pin is not None:  # connect to left
                     from_connector = self.connectors[connection.from_name]
                     from_pin_index = from_connector.pins.index(connection.from_pin)
-                    from_port_str = (
-                        f":p{from_pin_index+1}r"
-                        if from_connector.style != "simple"
-                        else ""
+                    reference(connection.from_name)
+                    from_port_str = port_str(
+                        connection.from_name, connection.from_pin, "r"
                     )
                     code_left_1 = f"{connection.from_name}{from_port_str}:e"
                     code_left_2 = f"{cable.name}:w{connection.via_port}:w"
@@ -498,9 +698,8 @@ class Harness:
                 if connection.to_pin is not None:  # connect to right
                     to_connector = self.connectors[connection.to_name]
                     to_pin_index = to_connector.pins.index(connection.to_pin)
-                    to_port_str = (
-                        f":p{to_pin_index+1}l" if to_connector.style != "simple" else ""
-                    )
+                    reference(connection.to_name)
+                    to_port_str = port_str(connection.to_name, connection.to_pin, "l")
                     code_right_1 = f"{cable.name}:w{connection.via_port}:e"
                     code_right_2 = f"{connection.to_name}{to_port_str}:w"
                     dot.edge(code_right_1, code_right_2)
@@ -534,6 +733,12 @@ class Harness:
 
         # mates
         for mate in self.mates:
+            if not (included(mate.from_name) or included(mate.to_name)):
+                continue
+            if not (included(mate.from_name) or reference(mate.from_name)):
+                continue  # mate to a component not shown at all
+            if not (included(mate.to_name) or reference(mate.to_name)):
+                continue
             if mate.shape[-1] == ">":
                 dir = "both" if mate.shape[0] == "<" else "forward"
             else:
@@ -546,24 +751,28 @@ class Harness:
             else:
                 raise Exception(f"{mate} is an unknown mate")
 
-            from_connector = self.connectors[mate.from_name]
-            to_connector = self.connectors[mate.to_name]
-            if isinstance(mate, MatePin) and from_connector.style != "simple":
-                from_pin_index = from_connector.pins.index(mate.from_pin)
-                from_port_str = f":p{from_pin_index+1}r"
-            else:  # MateComponent or style == 'simple'
-                from_port_str = ""
-            if isinstance(mate, MatePin) and to_connector.style != "simple":
-                to_pin_index = to_connector.pins.index(mate.to_pin)
-                to_port_str = f":p{to_pin_index+1}l"
-            else:  # MateComponent or style == 'simple'
-                to_port_str = ""
+            if isinstance(mate, MatePin):
+                from_port_str = port_str(mate.from_name, mate.from_pin, "r")
+                to_port_str = port_str(mate.to_name, mate.to_pin, "l")
+            else:  # MateComponent
+                from_port_str = to_port_str = ""
             code_from = f"{mate.from_name}{from_port_str}:e"
             code_to = f"{mate.to_name}{to_port_str}:w"
 
             dot.attr("edge", color=color, style="dashed", dir=dir)
             dot.edge(code_from, code_to)
 
+        # components on other sheets
+        for name in referenced:
+            dot.node(
+                name,
+                label=f"<{remove_links(name)}<br/>{references[name]}>",
+                shape="box",
+                style="filled,dashed",
+                margin="0.1",
+                fillcolor=translate_color(self.options.bgcolor_node, "HEX"),
+            )
+
         def typecheck(name: str, value: Any, expect: type) -> None:
             if not isinstance(value, expect):
                 raise Exception(
@@ -668,46 +877,252 @@ class Harness:
         fmt: tuple = ("html", "png", "svg", "tsv"),
     ) -> None:
         # graphical output
-        graph = self.graph
         svg_already_exists = Path(
             f"{filename}.svg"
         ).exists()  # if SVG already exists, do not delete later
-        # graphical output
-        for f in fmt:
-            if f in ("png", "svg", "html"):
-                if f == "html":  # if HTML format is specified,
-                    f = "svg"  # generate SVG for embedding into HTML
-                # SVG file will be renamed/deleted later
-                _filename = f"{filename}.tmp" if f == "svg" else filename
-                # TODO: prevent rendering SVG twice when both SVG and HTML are specified
-                graph.format = f
-                graph.render(filename=_filename, view=view, cleanup=cleanup)
+        # graphical output; sheets only matter for diagrams
+        sheets = self.sheets() if self._graphical_formats(fmt) else []
+        if len(sheets) > 1:
+            diagrams = self._render_sheets(filename, fmt, sheets, view, cleanup)
+        else:
+            diagrams = [filename]
+            if not self._render_components(filename, fmt):  # render as a whole
+                for f in fmt:
+                    if f in ("png", "svg", "html"):
+                        if f == "html":  # if HTML format is specified,
+                            f = "svg"  # generate SVG for embedding into HTML
+                        # SVG file will be renamed/deleted later
+                        _filename = f"{filename}.tmp" if f == "svg" else filename
+                        # TODO: prevent rendering SVG twice when both SVG and HTML are specified
+                        self.graph.format = f
+                        self.graph.render(
+                            filename=_filename, view=view, cleanup=cleanup
+                        )
         # embed images into SVG output
         if "svg" in fmt or "html" in fmt:
-            embed_svg_images_file(f"{filename}.tmp.svg")
+            for diagram in diagrams:
+                embed_svg_images_file(f"{diagram}.tmp.svg")
         # GraphViz output
         if "gv" in fmt:
-            graph.save(filename=f"{filename}.gv")
+            self.graph.save(filename=f"{filename}.gv")
+        # netlist output
+        if "nets" in fmt:
+            from wireviz.wv_netlist import Netlist, write_nets_csv, write_nets_json
+
+            netlist = Netlist(self)
+            with open_file_write(f"{filename}.nets.json") as file:
+                write_nets_json(file, netlist)
+            with open_file_write(f"{filename}.nets.csv", newline="") as file:
+                write_nets_csv(file, netlist)
+        # snapshot of the built harness, to be loaded again without parsing
+        if "snapshot" in fmt:
+            from wireviz.wv_snapshot import write_snapshot
+
+            write_snapshot(f"{filename}.harness.json", self)
+        # electrical and mass analysis
+        if "analysis" in fmt:
+            from wireviz.wv_analysis import analyze_harness, write_analysis_json
+
+            with open_file_write(f"{filename}.analysis.json") as file:
+                write_analysis_json(file, analyze_harness(self))
+        # from/to wire list
+        if "wires" in fmt:
+            from wireviz.wv_wirelist import write_wire_list_tsv
+
+            with open_file_write(f"{filename}.wires.tsv") as file:
+                write_wire_list_tsv(file, self)
+        # quick preview, drawn without GraphViz
+        if "preview" in fmt:
+            from wireviz.wv_preview import generate_preview_svg
+
+            file_write_text(f"{filename}.preview.svg", generate_preview_svg(self))
         # BOM output
         bomlist = bom_list(self.bom())
         if "tsv" in fmt:
-            file_write_text(f"{filename}.bom.tsv", tuplelist2tsv(bomlist))
+            with open_file_write(f"{filename}.bom.tsv") as file:
+                write_bom_tsv(file, bomlist)
         if "csv" in fmt:
-            # TODO: implement CSV output (preferrably using CSV library)
-            print("CSV output is not yet supported")
+            with open_file_write(f"{filename}.bom.csv", newline="") as file:
+                write_bom_csv(file, bomlist)
+        if "jsonl" in fmt:
+            with open_file_write(f"{filename}.bom.jsonl") as file:
+                write_bom_jsonl(file, bomlist)
         # HTML output
         if "html" in fmt:
-            generate_html_output(filename, bomlist, self.metadata, self.options)
+            generate_html_output(
+                filename, bomlist, self.metadata, self.options, diagrams
+            )
         # PDF output
         if "pdf" in fmt:
             # TODO: implement PDF output
             print("PDF output is not yet supported")
         # delete SVG if not needed
-        if "html" in fmt and not "svg" in fmt:
-            # SVG file was just needed to generate HTML
-            Path(f"{filename}.tmp.svg").unlink()
-        elif "svg" in fmt:
-            Path(f"{filename}.tmp.svg").replace(f"{filename}.svg")
+        for diagram in diagrams:
+            if "html" in fmt and not "svg" in fmt:
+                # SVG file was just needed to generate HTML
+                Path(f"{diagram}.tmp.svg").unlink()
+            elif "svg" in fmt:
+                Path(f"{diagram}.tmp.svg").replace(f"{diagram}.svg")
+
+    def sheets(self) -> List[Tuple[str, List[str]]]:
+        """Return the name and the designators of each sheet of the harness.
+
+        Components are assigned to sheets by their sheet attribute, or else
+        automatically if the sheet_size option is set.
+        """
+        designators = [*self.connectors, *self.cables]
+        assigned = {
+            component.name: component.sheet
+            for component in [*self.connectors.values(), *self.cables.values()]
+            if component.sheet is not None
+        }
+        if assigned:
+            return self._sheets_assigned(designators, assigned)
+        sheet_size = self.options.sheet_size
+        if sheet_size and len(designators) > sheet_size:
+            return self._sheets_by_size(sheet_size)
+        return [("1", designators)]
+
+    def _neighbours(self) -> Dict[str, List[str]]:
+        """Return the components joined to each component by connections or mates."""
+        neighbours = {name: [] for name in [*self.connectors, *self.cables]}
+
+        def join(a: str, b: str) -> None:
+            neighbours[a].append(b)
+            neighbours[b].append(a)
+
+        for cable in self.cables.values():
+            for connection in cable.connections:
+                if connection.from_name is not None:
+                    join(cable.name, connection.from_name)
+                if connection.to_name is not None:
+                    join(cable.name, connection.to_name)
+        for mate in self.mates:
+            join(mate.from_name, mate.to_name)
+        return neighbours
+
+    def _sheets_assigned(
+        self, designators: List[str], assigned: Dict[str, Union[int, str]]
+    ) -> List[Tuple[str, List[str]]]:
+        # components without sheet attribute are placed on the sheet
+        # of the nearest connected component that has one
+        sheet_of = dict(assigned)
+        neighbours = self._neighbours()
+        queue = deque(name for name in designators if name in assigned)
+        while queue:
+            name = queue.popleft()
+            for neighbour in neighbours[name]:
+                if neighbour not in sheet_of:
+                    sheet_of[neighbour] = sheet_of[name]
+                    queue.append(neighbour)
+
+        # sheets are numbered in order of appearance, unless all are numbers
+        names = list(dict.fromkeys(sheet_of[name] for name in designators))
+        if all(isinstance(name, int) for name in names):
+            names.sort()
+        sheets = {name: [] for name in names}
+        for name in designators:
+            sheets[sheet_of.get(name, names[0])].append(name)
+        return [(str(name), members) for name, members in sheets.items()]
+
+    def _sheets_by_size(self, sheet_size: int) -> List[Tuple[str, List[str]]]:
+        neighbours = self._neighbours()
+        sheets = [[]]
+        for group in self.connected_components():
+            if sheets[-1] and len(sheets[-1]) + len(group) > sheet_size:
+                if len(group) <= sheet_size:
+                    sheets.append([])  # keep small groups on one sheet
+            # visit large groups breadth first, to keep nearby components together
+            order = dict.fromkeys(group[:1])
+            queue = deque(order)
+            while queue:
+                for neighbour in neighbours[queue.popleft()]:
+                    if neighbour not in order:
+                        order[neighbour] = None
+                        queue.append(neighbour)
+            for name in order:
+                if len(sheets[-1]) >= sheet_size:
+                    sheets.append([])
+                sheets[-1].append(name)
+        return [(str(number), members) for number, members in enumerate(sheets, 1)]
+
+    def _render_sheets(
+        self,
+        filename: Union[str, Path],
+        fmt: tuple,
+        sheets: List[Tuple[str, List[str]]],
+        view: bool,
+        cleanup: bool,
+    ) -> List[str]:
+        """Lay out each sheet in a separate Graphviz process, in parallel.
+
+        Return the file names (without extension) of the sheet diagrams;
+        the first sheet keeps the plain file name.
+        """
+        from wireviz.wv_layout import run_parallel
+
+        references = {}  # text shown for components on other sheets
+        for number, (name, members) in enumerate(sheets, 1):
+            text = f"see sheet {number}"
+            if name != str(number):
+                text += f" ({remove_links(name)})"
+            references.update(dict.fromkeys(members, text))
+        graphs = [self.create_graph(set(members), references) for _, members in sheets]
+        diagrams = [str(filename)] + [
+            f"{filename}.sheet{number}" for number in range(2, len(sheets) + 1)
+        ]
+        formats = [f for f in ("png", "svg") if f in self._graphical_formats(fmt)]
+
+        def render(job: Tuple["Graph", str]) -> None:
+            graph, diagram = job
+            for f in formats:
+                graph.format = f
+                # SVG file will be renamed/deleted later
+                _filename = f"{diagram}.tmp" if f == "svg" else diagram
+                graph.render(filename=_filename, view=view, cleanup=cleanup)
+
+        run_parallel(render, list(zip(graphs, diagrams)))
+        return diagrams
+
+    @staticmethod
+    def _graphical_formats(fmt: tuple) -> set:
+        # generate SVG for embedding into HTML
+        return {"svg" if f == "html" else f for f in fmt} & {"png", "svg"}
+
+    def _render_components(self, filename: Union[str, Path], fmt: tuple) -> bool:
+        """Lay out independent parts of the harness in parallel, if enabled.
+
+        Return False if the harness needs to be rendered as a whole instead.
+        """
+        formats = self._graphical_formats(fmt)
+        if not self.options.parallel_layout or not formats:
+            return False
+        if self.tweak.append is not None:
+            return False  # appended code may refer to any component
+
+        from wireviz.wv_layout import (
+            balance,
+            packing_available,
+            parallel_jobs,
+            render_packed,
+        )
+
+        # combine small components to run no more layout processes than useful
+        batches = balance(self.connected_components(), parallel_jobs())
+        if len(batches) < 2:
+            return False
+        if not packing_available():
+            print("Warning: gvpack or neato not found, using a single layout run")
+            return False
+
+        graphs = [self.create_graph(set(batch)) for batch in batches]
+        outputs = {
+            # SVG file will be renamed/deleted later, as when rendering as a whole
+            f: f"{filename}.tmp.svg" if f == "svg" else f"{filename}.{f}"
+            for f in sorted(formats)
+        }
+        render_packed(graphs, outputs)
+        return True
 
     def bom(self):
         if not self._bom:
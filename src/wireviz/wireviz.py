@@ -3,23 +3,18 @@
 
 import platform
 import sys
+from collections import ChainMap
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Union
 
-import yaml
-
 if __name__ == "__main__":
     sys.path.insert(0, str(Path(__file__).parent.parent))  # add src/wireviz to PATH
 
 from wireviz.DataClasses import Metadata, Options, Tweak
 from wireviz.Harness import Harness
-from wireviz.wv_helper import (
-    expand,
-    file_read_text,
-    get_single_key_and_value,
-    is_arrow,
-    smart_file_resolve,
-)
+from wireviz.wv_connections import ComponentKind, ConnectionSetCompiler
+from wireviz.wv_helper import FileResolver, file_read_text
+from wireviz.wv_validate import Severity, validate
 
 from . import APP_NAME
 
@@ -30,7 +25,11 @@ def parse(
     output_formats: Union[None, str, Tuple[str]] = None,
     output_dir: Union[str, Path] = None,
     output_name: Union[None, str] = None,
-    image_paths: Union[Path, str, List] = [],
+    image_paths: Union[Path, str, List, FileResolver] = [],
+    yaml_cache_dir: Union[str, Path, None] = None,
+    stream_connections: bool = False,
+    validate_only: bool = False,
+    library: Union[Path, str, List, None] = None,
 ) -> Any:
     """
     This function takes an input, parses it as a WireViz Harness file,
@@ -47,13 +46,19 @@ def parse(
         * "harness": the diagram as a Harness Python object
 
     Supported output formats:
+        * "analysis": resistance, voltage drop and copper mass of all wires, as a JSON file
         * "csv":  the BOM, as a comma-separated text file
         * "gv":   the diagram, as a GraphViz source file
         * "html": the diagram and (depending on the template) the BOM, as a HTML file
+        * "jsonl": the BOM, as a JSON Lines text file (one JSON object per row)
+        * "nets": the electrical nets, as JSON and CSV files
         * "png":  the diagram, as a PNG raster image
         * "pdf":  the diagram and (depending on the template) the BOM, as a PDF file
+        * "preview": a quick drawing of the diagram made without GraphViz, as a SVG file
+        * "snapshot": the harness as built, as a JSON file to be loaded with wv_snapshot
         * "svg":  the diagram, as a SVG vector image
         * "tsv":  the BOM, as a tab-separated text file
+        * "wires": the from/to wire list, as a tab-separated text file
 
     Args:
         inp (Path | str | Dict):
@@ -71,10 +76,30 @@ def parse(
             The name to use for the generated output files (without extension).
             Defaults to inp's file name (without extension).
             Required parameter if inp is not a path.
-        image_paths (Path | str | List, optional):
+        image_paths (Path | str | List | FileResolver, optional):
             Paths to use when resolving any image paths included in the data.
+            A FileResolver can be passed instead to share its memoized lookups
+            between several calls, e.g. when processing a batch of files.
             Note: If inp is a path to a YAML file,
             its parent directory will automatically be included in the list.
+        yaml_cache_dir (Path | str, optional):
+            Directory to cache parsed YAML data in, keyed by a hash of the YAML text.
+            Unchanged input is then loaded from the cache instead of being parsed again.
+        stream_connections (bool, optional):
+            Read the connection sets from the YAML input one at a time while
+            populating the harness, instead of loading them all at once.
+            This keeps memory use low for very large inputs.
+            Does not apply if inp is a Dict, and yaml_cache_dir is then not used.
+        validate_only (bool, optional):
+            Only build the harness, validate it and generate the BOM,
+            without creating the diagram or writing any files.
+            return_types and output_formats are ignored.
+        library (Path | str | List, optional):
+            Component library files or directories, in addition to those
+            given by the library key of the input. Connector and cable
+            templates not defined in the input are looked up there, and
+            only the templates that are referenced are read.
+            Relative paths are resolved like image paths.
 
     Returns:
         Depending on the return_types parameter, may return:
@@ -83,12 +108,26 @@ def parse(
             * PNG data
             * SVG data
             * a Harness object
+        * if validate_only is set: a list of all validation findings
     """
 
-    if not output_formats and not return_types:
+    if validate_only:
+        output_formats = return_types = None
+    elif not output_formats and not return_types:
         raise Exception("No output formats or return types specified")
 
-    yaml_data, yaml_file = _get_yaml_data_and_path(inp)
+    connection_sets = None
+    if stream_connections:
+        yaml_source, yaml_file = _get_yaml_source_and_path(inp)
+        if isinstance(yaml_source, Dict):
+            yaml_data = yaml_source
+        else:
+            from wireviz.wv_yaml import iter_yaml_sequence, load_yaml_sections
+
+            yaml_data = load_yaml_sections(yaml_source, "connections")
+            connection_sets = iter_yaml_sequence(yaml_source, "connections")
+    else:
+        yaml_data, yaml_file = _get_yaml_data_and_path(inp, yaml_cache_dir)
     if not isinstance(yaml_data, dict):
         raise TypeError(
             f"Expected a dict as top-level YAML input, but got: {type(yaml_data)}"
@@ -99,28 +138,28 @@ def parse(
         output_name = _get_output_name(yaml_file, output_name)
         output_file = output_dir / output_name
 
+    if isinstance(image_paths, FileResolver):
+        image_resolver = image_paths
+    else:
+        image_resolver = FileResolver(image_paths)
     if yaml_file:
         # if reading from file, ensure that input file's parent directory is included in image_paths
-        default_image_path = yaml_file.parent.resolve()
-        if not default_image_path in [Path(x).resolve() for x in image_paths]:
-            image_paths.append(default_image_path)
+        image_resolver.add_path(yaml_file.parent)
 
     # define variables =========================================================
     # containers for parsed component data and connection sets
     template_connectors = {}
     template_cables = {}
-    connection_sets = []
+    library_paths = []
+    for paths in (yaml_data.get("library"), library):
+        if paths:
+            library_paths.extend(paths if isinstance(paths, list) else [paths])
     # actual harness
     harness = Harness(
         metadata=Metadata(**yaml_data.get("metadata", {})),
         options=Options(**yaml_data.get("options", {})),
         tweak=Tweak(**yaml_data.get("tweak", {})),
     )
-    # others
-    # store mapping of components to their respective template
-    designators_and_templates = {}
-    # keep track of auto-generated designators to avoid duplicates
-    autogenerated_designators = {}
 
     # When title is not given, either deduce it from filename, or use default text.
     if "title" not in harness.metadata:
@@ -142,9 +181,7 @@ def parse(
                             image_path = image["src"]
                             if image_path and not Path(image_path).is_absolute():
                                 # resolve relative image path
-                                image["src"] = smart_file_resolve(
-                                    image_path, image_paths
-                                )
+                                image["src"] = image_resolver.resolve(image_path)
                         if sec == "connectors":
                             template_connectors[key] = attribs
                         elif sec == "cables":
@@ -157,223 +194,44 @@ def parse(
             elif ty == list:
                 yaml_data[sec] = []
 
-    connection_sets = yaml_data["connections"]
+    if connection_sets is None:  # not streamed
+        connection_sets = yaml_data["connections"]
 
     # go through connection sets, generate and connect components ==============
 
-    template_separator_char = harness.options.template_separator
-
-    def resolve_designator(inp, separator):
-        if separator in inp:  # generate a new instance of an item
-            if inp.count(separator) > 1:
-                raise Exception(f"{inp} - Found more than one separator ({separator})")
-            template, designator = inp.split(separator)
-            if designator == "":
-                autogenerated_designators[template] = (
-                    autogenerated_designators.get(template, 0) + 1
-                )
-                designator = f"__{template}_{autogenerated_designators[template]}"
-            # check if redefining existing component to different template
-            if designator in designators_and_templates:
-                if designators_and_templates[designator] != template:
-                    raise Exception(
-                        f"Trying to redefine {designator} from {designators_and_templates[designator]} to {template}"
-                    )
-            else:
-                designators_and_templates[designator] = template
-        else:
-            template, designator = (inp, inp)
-            if designator in designators_and_templates:
-                pass  # referencing an exiting connector, no need to add again
-            else:
-                designators_and_templates[designator] = template
-        return (template, designator)
-
-    # utilities to check for alternating connectors and cables/arrows ==========
-
-    alternating_types = ["connector", "cable/arrow"]
-    expected_type = None
-
-    def check_type(designator, template, actual_type):
-        nonlocal expected_type
-        if not expected_type:  # each connection set may start with either section
-            expected_type = actual_type
+    if library_paths:
+        from wireviz.wv_library import ComponentLibrary
 
-        if actual_type != expected_type:  # did not alternate
-            raise Exception(
-                f'Expected {expected_type}, but "{designator}" ("{template}") is {actual_type}'
-            )
-
-    def alternate_type():  # flip between connector and cable/arrow
-        nonlocal expected_type
-        expected_type = alternating_types[1 - alternating_types.index(expected_type)]
+        component_library = ComponentLibrary(
+            [image_resolver.resolve(path) for path in library_paths], yaml_cache_dir
+        )
+        # templates defined in the input take precedence over the library
+        compiler_connectors = ChainMap(
+            template_connectors, component_library.sections["connectors"]
+        )
+        compiler_cables = ChainMap(
+            template_cables, component_library.sections["cables"]
+        )
+    else:
+        compiler_connectors, compiler_cables = template_connectors, template_cables
 
+    compiler = ConnectionSetCompiler(
+        compiler_connectors, compiler_cables, harness.options.template_separator
+    )
     for connection_set in connection_sets:
-        # figure out number of parallel connections within this set
-        connectioncount = []
-        for entry in connection_set:
-            if isinstance(entry, list):
-                connectioncount.append(len(entry))
-            elif isinstance(entry, dict):
-                connectioncount.append(len(expand(list(entry.values())[0])))
-                # e.g.: - X1: [1-4,6] yields 5
-            else:
-                pass  # strings do not reveal connectioncount
-        if not any(connectioncount):
-            # no item in the list revealed connection count;
-            # assume connection count is 1
-            connectioncount = [1]
-            # Example: The following is a valid connection set,
-            #          even though no item reveals the connection count;
-            #          the count is not needed because only a component-level mate happens.
-            # -
-            #   - CONNECTOR
-            #   - ==>
-            #   - CONNECTOR
-
-        # check that all entries are the same length
-        if len(set(connectioncount)) > 1:
-            raise Exception(
-                "All items in connection set must reference the same number of connections"
-            )
-        # all entries are the same length, connection count is set
-        connectioncount = connectioncount[0]
-
-        # expand string entries to list entries of correct length
-        for index, entry in enumerate(connection_set):
-            if isinstance(entry, str):
-                connection_set[index] = [entry] * connectioncount
-
-        # resolve all designators
-        for index, entry in enumerate(connection_set):
-            if isinstance(entry, list):
-                for subindex, item in enumerate(entry):
-                    template, designator = resolve_designator(
-                        item, template_separator_char
-                    )
-                    connection_set[index][subindex] = designator
-            elif isinstance(entry, dict):
-                key = list(entry.keys())[0]
-                template, designator = resolve_designator(key, template_separator_char)
-                value = entry[key]
-                connection_set[index] = {designator: value}
-            else:
-                pass  # string entries have been expanded in previous step
-
-        # expand all pin lists
-        for index, entry in enumerate(connection_set):
-            if isinstance(entry, list):
-                connection_set[index] = [{designator: 1} for designator in entry]
-            elif isinstance(entry, dict):
-                designator = list(entry.keys())[0]
-                pinlist = expand(entry[designator])
-                connection_set[index] = [{designator: pin} for pin in pinlist]
+        compiled_set = compiler.compile(connection_set)
+
+        # generate components referenced for the first time
+        for id in compiled_set.new_ids:
+            designator = compiler.designators[id]
+            template = compiler.templates[id]
+            if compiler.kinds[id] == ComponentKind.CONNECTOR:
+                harness.add_connector(name=designator, **compiler_connectors[template])
             else:
-                pass  # string entries have been expanded in previous step
+                harness.add_cable(name=designator, **compiler_cables[template])
 
         # Populate wiring harness ==============================================
-
-        expected_type = None  # reset check for alternating types
-        # at the beginning of every connection set
-        # since each set may begin with either type
-
-        # generate components
-        for entry in connection_set:
-            for item in entry:
-                designator = list(item.keys())[0]
-                template = designators_and_templates[designator]
-
-                if designator in harness.connectors:  # existing connector instance
-                    check_type(designator, template, "connector")
-                elif template in template_connectors.keys():
-                    # generate new connector instance from template
-                    check_type(designator, template, "connector")
-                    harness.add_connector(
-                        name=designator, **template_connectors[template]
-                    )
-
-                elif designator in harness.cables:  # existing cable instance
-                    check_type(designator, template, "cable/arrow")
-                elif template in template_cables.keys():
-                    # generate new cable instance from template
-                    check_type(designator, template, "cable/arrow")
-                    harness.add_cable(name=designator, **template_cables[template])
-
-                elif is_arrow(designator):
-                    check_type(designator, template, "cable/arrow")
-                    # arrows do not need to be generated here
-                else:
-                    raise Exception(
-                        f"{template} is an unknown template/designator/arrow."
-                    )
-
-            alternate_type()  # entries in connection set must alternate between connectors and cables/arrows
-
-        # transpose connection set list
-        # before: one item per component, one subitem per connection in set
-        # after:  one item per connection in set, one subitem per component
-        connection_set = list(map(list, zip(*connection_set)))
-
-        # connect components
-        for index_entry, entry in enumerate(connection_set):
-            for index_item, item in enumerate(entry):
-                designator = list(item.keys())[0]
-
-                if designator in harness.cables:
-                    if index_item == 0:
-                        # list started with a cable, no connector to join on left side
-                        from_name, from_pin = (None, None)
-                    else:
-                        from_name, from_pin = get_single_key_and_value(
-                            entry[index_item - 1]
-                        )
-                    via_name, via_pin = (designator, item[designator])
-                    if index_item == len(entry) - 1:
-                        # list ends with a cable, no connector to join on right side
-                        to_name, to_pin = (None, None)
-                    else:
-                        to_name, to_pin = get_single_key_and_value(
-                            entry[index_item + 1]
-                        )
-                    harness.connect(
-                        from_name, from_pin, via_name, via_pin, to_name, to_pin
-                    )
-
-                elif is_arrow(designator):
-                    if index_item == 0:  # list starts with an arrow
-                        raise Exception(
-                            "An arrow cannot be at the start of a connection set"
-                        )
-                    elif index_item == len(entry) - 1:  # list ends with an arrow
-                        raise Exception(
-                            "An arrow cannot be at the end of a connection set"
-                        )
-
-                    from_name, from_pin = get_single_key_and_value(
-                        entry[index_item - 1]
-                    )
-                    via_name, via_pin = (designator, None)
-                    to_name, to_pin = get_single_key_and_value(entry[index_item + 1])
-                    if "-" in designator:  # mate pin by pin
-                        harness.add_mate_pin(
-                            from_name, from_pin, to_name, to_pin, designator
-                        )
-                    elif "=" in designator and index_entry == 0:
-                        # mate two connectors as a whole
-                        harness.add_mate_component(from_name, to_name, designator)
-
-    # warn about unused templates
-
-    proposed_components = list(template_connectors.keys()) + list(
-        template_cables.keys()
-    )
-    used_components = set(designators_and_templates.values())
-    forgotten_components = [c for c in proposed_components if not c in used_components]
-    if len(forgotten_components) > 0:
-        print(
-            "Warning: The following components are not referenced in any connection set:"
-        )
-        print(", ".join(forgotten_components))
+        harness.connect_set(compiled_set)
 
     # harness population completed =============================================
 
@@ -381,6 +239,21 @@ def parse(
         for line in yaml_data["additional_bom_items"]:
             harness.add_bom_item(line)
 
+    # validate the harness, warning about unused templates and other problems
+
+    proposed_components = list(template_connectors.keys()) + list(
+        template_cables.keys()
+    )
+    used_components = set(compiler.templates)
+    forgotten_components = [c for c in proposed_components if not c in used_components]
+    findings = validate(harness, forgotten_components)
+    if validate_only:
+        harness.bom()  # may raise on inconsistent BOM data
+        return findings
+    for finding in findings:
+        if finding.severity >= Severity.WARNING:
+            print(finding)
+
     if output_formats:
         harness.output(filename=output_file, fmt=output_formats, view=False)
 
@@ -402,37 +275,51 @@ def parse(
         return tuple(returns) if len(returns) != 1 else returns[0]
 
 
-def _get_yaml_data_and_path(inp: Union[str, Path, Dict]) -> (Dict, Path):
-    # determine whether inp is a file path, a YAML string, or a Dict
-    if not isinstance(inp, Dict):  # received a str or a Path
-        try:
-            yaml_path = Path(inp).expanduser().resolve(strict=True)
-            # if no FileNotFoundError exception happens, get file contents
-            yaml_str = file_read_text(yaml_path)
-        except (FileNotFoundError, OSError, ValueError) as e:
-            # if inp is a long YAML string, Pathlib will normally raise
-            # FileNotFoundError or OSError(errno = ENAMETOOLONG) when
-            # trying to expand and resolve it as a path, but in Windows
-            # might ValueError or OSError(errno = EINVAL or None) be raised
-            # instead in some cases (depending on the Python version).
-            # Catch these specific errors, but raise any others.
-
-            from errno import EINVAL, ENAMETOOLONG
-
-            if type(e) is OSError and e.errno not in (EINVAL, ENAMETOOLONG, None):
-                print(
-                    f"OSError(errno={e.errno}) in Python {sys.version} at {platform.platform()}"
-                )
-                raise e
-            # file does not exist; assume inp is a YAML string
-            yaml_str = inp
-            yaml_path = None
-        yaml_data = yaml.safe_load(yaml_str)
-    else:
+def _get_yaml_data_and_path(
+    inp: Union[str, Path, Dict], cache_dir: Union[str, Path, None] = None
+) -> (Dict, Path):
+    yaml_source, yaml_path = _get_yaml_source_and_path(inp)
+    if isinstance(yaml_source, Dict):
         # received a Dict, use as-is
-        yaml_data = inp
-        yaml_path = None
-    return yaml_data, yaml_path
+        return yaml_source, yaml_path
+
+    from wireviz.wv_yaml import load_yaml  # Only needed when parsing YAML text
+
+    if isinstance(yaml_source, Path):
+        yaml_source = file_read_text(yaml_source)
+    return load_yaml(yaml_source, cache_dir), yaml_path
+
+
+def _get_yaml_source_and_path(
+    inp: Union[str, Path, Dict],
+) -> (Union[str, Path, Dict], Path):
+    # determine whether inp is a file path, a YAML string, or a Dict
+    if isinstance(inp, Dict):
+        return inp, None
+    if isinstance(inp, str) and "\n" in inp:
+        # a path never contains line breaks; avoid asking the file system
+        return inp, None
+    try:
+        yaml_path = Path(inp).expanduser().resolve(strict=True)
+        # if no FileNotFoundError exception happens, inp is an existing file
+        return yaml_path, yaml_path
+    except (FileNotFoundError, OSError, ValueError) as e:
+        # if inp is a long YAML string, Pathlib will normally raise
+        # FileNotFoundError or OSError(errno = ENAMETOOLONG) when
+        # trying to expand and resolve it as a path, but in Windows
+        # might ValueError or OSError(errno = EINVAL or None) be raised
+        # instead in some cases (depending on the Python version).
+        # Catch these specific errors, but raise any others.
+
+        from errno import EINVAL, ENAMETOOLONG
+
+        if type(e) is OSError and e.errno not in (EINVAL, ENAMETOOLONG, None):
+            print(
+                f"OSError(errno={e.errno}) in Python {sys.version} at {platform.platform()}"
+            )
+            raise e
+        # file does not exist; assume inp is a YAML string
+        return inp, None
 
 
 def _get_output_dir(input_file: Path, default_output_dir: Path) -> Path:
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+
+import json
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, TextIO, Union
+
+if TYPE_CHECKING:
+    import numpy
+
+    from wireviz.Harness import Harness
+
+COPPER_RESISTIVITY = 0.017241  # ohm * mm² / m at 20 °C (annealed copper)
+COPPER_TEMPERATURE_COEFFICIENT = 0.00393  # per K
+COPPER_DENSITY = 8.96  # g/cm³, i.e. grams per mm² and meter
+
+LENGTH_UNITS = {  # meters per unit
+    "m": 1,
+    "cm": 0.01,
+    "mm": 0.001,
+    "km": 1000,
+    "in": 0.0254,
+    "ft": 0.3048,
+    "yd": 0.9144,
+}
+GAUGE_UNITS_MM2 = {"mm²": 1, "mm2": 1, "kcmil": 0.506707, "mcm": 0.506707}
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise Exception(
+            "Harness analysis requires NumPy, which can be installed with: "
+            "pip install wireviz[analysis]"
+        ) from None
+    return numpy
+
+
+def awg_to_mm2(awg) -> "numpy.ndarray":
+    """Return the cross section in mm² of the given AWG numbers (scalar or array)."""
+    np = _numpy()
+    diameter = 0.127 * 92 ** ((36 - np.asarray(awg, dtype=float)) / 39)  # mm
+    return np.pi / 4 * diameter**2
+
+
+def mm2_to_awg(mm2) -> "numpy.ndarray":
+    """Return the (fractional) AWG numbers of the given cross sections in mm²."""
+    np = _numpy()
+    diameter = np.sqrt(4 / np.pi * np.asarray(mm2, dtype=float))
+    return 36 - 39 * np.log(diameter / 0.127) / np.log(92)
+
+
+def awg_number(awg: Union[int, float, str]) -> float:
+    """Return the AWG number, also for gauges written as 4/0 or 0000."""
+    awg = str(awg).strip()
+    if awg.endswith("/0"):
+        return 1 - int(awg[:-2])
+    if len(awg) > 1 and set(awg) == {"0"}:
+        return 1 - len(awg)
+    return float(awg)
+
+
+@dataclass
+class HarnessAnalysis:
+    """Electrical and mass figures of all cable wires, as arrays with one element per wire.
+
+    Values are NaN where the gauge or length of a cable is unknown.
+    Shields are not included.
+    """
+
+    cables: List[str]  # cable designators
+    cable_index: "numpy.ndarray"  # index into cables of each wire
+    wire: "numpy.ndarray"  # wire number within its cable
+    area: "numpy.ndarray"  # conductor cross section, mm²
+    length: "numpy.ndarray"  # m
+    resistance: "numpy.ndarray"  # ohm
+    voltage_drop: "numpy.ndarray"  # V, at current
+    mass: "numpy.ndarray"  # copper mass, g
+    current: float  # A
+    temperature: float  # °C
+
+    def cable_mass(self) -> Dict[str, float]:
+        """Return the copper mass of each cable in g."""
+        np = _numpy()
+        masses = np.bincount(
+            self.cable_index, weights=self.mass, minlength=len(self.cables)
+        )
+        return dict(zip(self.cables, masses.tolist()))
+
+    @property
+    def total_mass(self) -> float:
+        """Return the copper mass of all wires with known gauge and length in g."""
+        return float(_numpy().nansum(self.mass))
+
+
+def analyze_harness(
+    harness: "Harness",
+    current: Optional[float] = None,
+    temperature: float = 20.0,
+) -> HarnessAnalysis:
+    """Return resistance, voltage drop and copper mass of all wires of the harness.
+
+    The current defaults to the analysis_current option of the harness.
+    Each cable is converted once; all per-wire figures are computed as arrays.
+    """
+    np = _numpy()
+    if current is None:
+        current = harness.options.analysis_current
+    cables = list(harness.cables.values())
+    areas = np.array([_cable_area(cable) for cable in cables], dtype=float)
+    lengths = np.array([_cable_length(cable) for cable in cables], dtype=float)
+    counts = np.array([cable.wirecount for cable in cables], dtype=int)
+
+    cable_index = np.repeat(np.arange(len(cables)), counts)
+    starts = np.cumsum(counts) - counts
+    wire = np.arange(counts.sum()) - np.repeat(starts, counts) + 1
+    area = areas[cable_index]
+    length = lengths[cable_index]
+    resistivity = COPPER_RESISTIVITY * (
+        1 + COPPER_TEMPERATURE_COEFFICIENT * (temperature - 20)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        resistance = resistivity * length / area
+    return HarnessAnalysis(
+        cables=[cable.name for cable in cables],
+        cable_index=cable_index,
+        wire=wire,
+        area=area,
+        length=length,
+        resistance=resistance,
+        voltage_drop=resistance * current,
+        mass=COPPER_DENSITY * area * length,
+        current=current,
+        temperature=temperature,
+    )
+
+
+def _cable_area(cable) -> float:
+    if cable.gauge is None:
+        return float("nan")
+    unit = cable.gauge_unit or "mm²"
+    if unit.upper() == "AWG":
+        return float(awg_to_mm2(awg_number(cable.gauge)))
+    factor = GAUGE_UNITS_MM2.get(unit.lower())
+    if factor is None:
+        print(f"Warning: Cable {cable.name} gauge unit {unit} is unknown to analysis")
+        return float("nan")
+    return float(cable.gauge) * factor
+
+
+def _cable_length(cable) -> float:
+    factor = LENGTH_UNITS.get(cable.length_unit)
+    if factor is None or not cable.length:
+        return float("nan")
+    return float(cable.length) * factor
+
+
+def _number(value: Any, digits: int = 6) -> Optional[float]:
+    """Return value rounded for output, or None if not a number."""
+    value = float(value)
+    return None if value != value else round(value, digits)
+
+
+def write_analysis_json(file: TextIO, analysis: HarnessAnalysis) -> None:
+    """Write the analysis to file as a JSON report, with totals and one entry per wire."""
+    np = _numpy()
+    cable_mass = analysis.cable_mass()
+    bounds = np.searchsorted(analysis.cable_index, np.arange(len(analysis.cables) + 1))
+    report = {
+        "current": analysis.current,
+        "temperature": analysis.temperature,
+        "total_mass": _number(analysis.total_mass),
+        "cables": [],
+    }
+    columns = {
+        "area": analysis.area.tolist(),
+        "length": analysis.length.tolist(),
+        "resistance": analysis.resistance.tolist(),
+        "voltage_drop": analysis.voltage_drop.tolist(),
+        "mass": analysis.mass.tolist(),
+    }
+    wires = analysis.wire.tolist()
+    for index, name in enumerate(analysis.cables):
+        rows = range(bounds[index], bounds[index + 1])
+        report["cables"].append(
+            {
+                "cable": name,
+                "mass": _number(cable_mass[name]),
+                "wires": [
+                    {
+                        "wire": wires[row],
+                        **{
+                            key: _number(values[row]) for key, values in columns.items()
+                        },
+                    }
+                    for row in rows
+                ],
+            }
+        )
+    json.dump(report, file, ensure_ascii=False, indent=1)
+    file.write("\n")
@@ -1,21 +1,25 @@
 # -*- coding: utf-8 -*-
 
+import csv
+import json
 from dataclasses import asdict
 from itertools import groupby
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
 
 from wireviz.DataClasses import AdditionalComponent, Cable, Color, Connector
 from wireviz.wv_colors import translate_color
 from wireviz.wv_gv_html import html_bgcolor_attr, html_line_breaks
-from wireviz.wv_helper import clean_whitespace
+from wireviz.wv_helper import clean_whitespace, remove_links
 
 BOM_COLUMNS_ALWAYS = ("id", "description", "qty", "unit", "designators")
 BOM_COLUMNS_OPTIONAL = ("pn", "manufacturer", "mpn", "supplier", "spn")
 BOM_COLUMNS_IN_KEY = ("description", "unit") + BOM_COLUMNS_OPTIONAL
+BOM_COLUMNS_SUMMED = ("mass",)  # computed values, added up like qty
 
 HEADER_PN = "P/N"
 HEADER_MPN = "MPN"
 HEADER_SPN = "SPN"
+HEADER_MASS = "Mass [g]"
 
 BOMKey = Tuple[str, ...]
 BOMColumn = str  # = Literal[*BOM_COLUMNS_ALWAYS, *BOM_COLUMNS_OPTIONAL]
@@ -99,6 +103,12 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
     """Return a list of BOM entries generated from the harness."""
     from wireviz.Harness import Harness  # Local import to avoid circular imports
 
+    cable_mass = {}
+    if harness.options.bom_mass:
+        from wireviz.wv_analysis import analyze_harness  # NumPy is optional
+
+        cable_mass = analyze_harness(harness).cable_mass()
+
     bom_entries = []
     # connectors
     for connector in harness.connectors.values():
@@ -154,6 +164,7 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
                         "unit": cable.length_unit,
                         "designators": cable.name if cable.show_name else None,
                         **optional_fields(cable),
+                        **mass_field(cable_mass.get(cable.name)),
                     }
                 )
             else:
@@ -179,6 +190,7 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
                                 k: index_if_list(v, index)
                                 for k, v in optional_fields(cable).items()
                             },
+                            **mass_field(cable_mass.get(cable.name), cable.wirecount),
                         }
                     )
 
@@ -201,13 +213,26 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
             (make_list(entry.get("designators")) for entry in group_entries), []
         )
         total_qty = sum(entry.get("qty", 1) for entry in group_entries)
+        totals = {
+            column: round(sum(entry[column] for entry in group_entries), 1)
+            for column in BOM_COLUMNS_SUMMED
+            if all(entry.get(column) is not None for entry in group_entries)
+        }
         bom.append(
             {
-                **group_entries[0],
-                "qty": int(total_qty)
-                if float(total_qty).is_integer()
-                else round(total_qty, 3),
+                # summed columns are only kept as totals over all entries
+                **{
+                    key: value
+                    for key, value in group_entries[0].items()
+                    if key not in BOM_COLUMNS_SUMMED
+                },
+                "qty": (
+                    int(total_qty)
+                    if float(total_qty).is_integer()
+                    else round(total_qty, 3)
+                ),
                 "designators": sorted(set(designators)),
+                **totals,
             }
         )
 
@@ -215,6 +240,13 @@ def generate_bom(harness: "Harness") -> List[BOMEntry]:
     return [{**entry, "id": index} for index, entry in enumerate(bom, 1)]
 
 
+def mass_field(mass: Optional[float], wirecount: int = 1) -> BOMEntry:
+    """Return the mass BOM field of a cable (or of one of its wires), if known."""
+    if mass is None or mass != mass:  # unknown or NaN
+        return {}
+    return {"mass": mass / wirecount}
+
+
 def get_bom_index(bom: List[BOMEntry], target: BOMKey) -> int:
     """Return id of BOM entry or raise exception if not found."""
     for entry in bom:
@@ -223,10 +255,61 @@ def get_bom_index(bom: List[BOMEntry], target: BOMKey) -> int:
     raise Exception("Internal error: No BOM entry found matching: " + "|".join(target))
 
 
+def merge_boms(
+    boms: Iterable[Tuple[str, List[BOMEntry], Union[int, float]]],
+) -> List[BOMEntry]:
+    """Return one BOM combining the BOMs of several harnesses.
+
+    boms yields the name of each harness, its BOM, and the number of such
+    harnesses needed. Entries are merged by their BOM key in a dict, with
+    quantities multiplied and added up. Summed columns such as mass are only
+    kept where all merged entries have a value, as in generate_bom().
+    Designators are prefixed with the harness name; entries without
+    designators list the harness name instead.
+    """
+    merged: Dict[BOMKey, BOMEntry] = {}
+    for name, bom, multiplier in boms:
+        for entry in bom:
+            key = bom_entry_key(entry)
+            total = merged.get(key)
+            if total is None:
+                total = merged[key] = {
+                    **entry,
+                    "qty": 0,
+                    "designators": [],
+                    **{column: 0 for column in BOM_COLUMNS_SUMMED},
+                }
+            total["qty"] += entry.get("qty", 1) * multiplier
+            for column in BOM_COLUMNS_SUMMED:
+                if total[column] is not None:  # None once any entry lacks a value
+                    value = entry.get(column)
+                    total[column] = (
+                        None if value is None else total[column] + value * multiplier
+                    )
+            designators = make_list(entry.get("designators"))
+            total["designators"].extend(
+                [f"{name}:{designator}" for designator in designators] or [name]
+            )
+
+    bom = []
+    for key in sorted(merged):
+        entry = merged[key]
+        qty = entry["qty"]
+        entry["qty"] = int(qty) if float(qty).is_integer() else round(qty, 3)
+        for column in BOM_COLUMNS_SUMMED:
+            if entry[column] is None:
+                del entry[column]
+            else:
+                entry[column] = round(entry[column], 1)
+        entry["designators"] = sorted(set(entry["designators"]))
+        bom.append(entry)
+    return [{**entry, "id": index} for index, entry in enumerate(bom, 1)]
+
+
 def bom_list(bom: List[BOMEntry]) -> List[List[str]]:
     """Return list of BOM rows as lists of column strings with headings in top row."""
     keys = list(BOM_COLUMNS_ALWAYS)  # Always include this fixed set of BOM columns.
-    for fieldname in BOM_COLUMNS_OPTIONAL:
+    for fieldname in BOM_COLUMNS_OPTIONAL + BOM_COLUMNS_SUMMED:
         # Include only those optional BOM columns that are in use.
         if any(entry.get(fieldname) for entry in bom):
             keys.append(fieldname)
@@ -236,6 +319,7 @@ def bom_list(bom: List[BOMEntry]) -> List[List[str]]:
         "pn": HEADER_PN,
         "mpn": HEADER_MPN,
         "spn": HEADER_SPN,
+        "mass": HEADER_MASS,
     }
     return [
         [bom_headings.get(k, k.capitalize()) for k in keys]
@@ -244,6 +328,42 @@ def bom_list(bom: List[BOMEntry]) -> List[List[str]]:
     ]  # Create string list for each entry row
 
 
+def bom_rows(bomlist: List[List[str]]) -> Iterator[List[str]]:
+    """Yield BOM rows as lists of column strings with any hyperlinks removed."""
+    for row in bomlist:
+        yield [remove_links(make_str(item)) for item in row]
+
+
+def write_bom_tsv(file: TextIO, bomlist: List[List[str]]) -> None:
+    """Write BOM rows to file as tab-separated text, one row at a time."""
+    # Cells never contain tabs or line breaks after clean_whitespace(),
+    # so no quoting is needed; this keeps quotes in descriptions as-is.
+    writer = csv.writer(
+        file,
+        delimiter="\t",
+        quoting=csv.QUOTE_NONE,
+        quotechar=None,
+        lineterminator="\n",
+    )
+    writer.writerows(bom_rows(bomlist))
+
+
+def write_bom_csv(file: TextIO, bomlist: List[List[str]]) -> None:
+    """Write BOM rows to file as comma-separated text, one row at a time.
+
+    The file should be opened with newline="" as required by the csv module.
+    """
+    csv.writer(file).writerows(bom_rows(bomlist))
+
+
+def write_bom_jsonl(file: TextIO, bomlist: List[List[str]]) -> None:
+    """Write BOM rows to file as JSON Lines, one object per row keyed by the column headers."""
+    rows = bom_rows(bomlist)
+    header = next(rows)
+    for row in rows:
+        file.write(json.dumps(dict(zip(header, row)), ensure_ascii=False) + "\n")
+
+
 def component_table_entry(
     type: str,
     qty: Union[int, float],
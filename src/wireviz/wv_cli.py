@@ -1,34 +1,69 @@
 # -*- coding: utf-8 -*-
 
+import contextlib
+import json
 import os
 import sys
 from pathlib import Path
+from typing import Tuple, Union
 
 import click
 
 if __name__ == "__main__":
     sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-import wireviz.wireviz as wv
 from wireviz import APP_NAME, __version__
-from wireviz.wv_helper import file_read_text
+from wireviz.wv_helper import FileResolver, file_read_text, open_file_write
 
 format_codes = {
-    # "c": "csv",
+    "a": "analysis",
+    "c": "csv",
     "g": "gv",
+    "H": "snapshot",
     "h": "html",
+    "j": "jsonl",
+    "n": "nets",
     "p": "png",
     # "P": "pdf",
     "s": "svg",
     "t": "tsv",
+    "w": "wires",
 }
 
 epilog = "The -f or --format option accepts a string containing one or more of the "
 epilog += "following characters to specify which file types to output:\n"
 epilog += ", ".join([f"{key} ({value.upper()})" for key, value in format_codes.items()])
+epilog += "\n\nFurther commands: diff (compare two harnesses) and bom-merge "
+epilog += "(combine the BOMs of several harnesses), see e.g. wireviz diff --help."
 
 
-@click.command(
+class DefaultCommandGroup(click.Group):
+    """Group of commands that runs the default command if no command name is given.
+
+    This keeps `wireviz FILE` working next to commands like `wireviz diff`.
+    """
+
+    def __init__(self, *args, default_command: str, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: list) -> list:
+        if not args or args[0] not in self.commands:
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(
+    cls=DefaultCommandGroup,
+    default_command="render",
+    context_settings=dict(help_option_names=["-h", "--help"]),
+)
+def cli():
+    pass
+
+
+@cli.command(
+    "render",
     epilog=epilog,
     no_args_is_help=True,
     context_settings=dict(help_option_names=["-h", "--help"]),
@@ -64,6 +99,44 @@ epilog += ", ".join([f"{key} ({value.upper()})" for key, value in format_codes.i
     type=str,
     help="File name (without extension) to use for output files, if different from input file name.",
 )
+@click.option(
+    "--colors",
+    default=[],
+    multiple=True,
+    type=Path,
+    help="YAML file defining additional colors and color codes (optional).",
+)
+@click.option(
+    "--yaml-cache",
+    default=None,
+    type=Path,
+    help="Directory to cache parsed YAML input in, to speed up repeated runs (optional).",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help="Read connection sets one at a time to reduce memory use for very large inputs.",
+)
+@click.option(
+    "--preview",
+    is_flag=True,
+    default=False,
+    help="Draw a quick SVG preview without GraphViz instead of PNG, SVG and HTML output.",
+)
+@click.option(
+    "--text",
+    is_flag=True,
+    default=False,
+    help="Print the connectivity of the harness as text instead of writing output files.",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    default=False,
+    help="Only validate the input files without writing any output, printing the findings "
+    "as JSON Lines and exiting with status 1 if there are errors.",
+)
 @click.option(
     "-V",
     "--version",
@@ -71,15 +144,33 @@ epilog += ", ".join([f"{key} ({value.upper()})" for key, value in format_codes.i
     default=False,
     help=f"Output {APP_NAME} version and exit.",
 )
-def wireviz(file, format, prepend, output_dir, output_name, version):
+def wireviz(
+    file,
+    format,
+    prepend,
+    output_dir,
+    output_name,
+    colors,
+    yaml_cache,
+    stream,
+    preview,
+    text,
+    check,
+    version,
+):
     """
     Parses the provided FILE and generates the specified outputs.
     """
-    print()
-    print(f"{APP_NAME} {__version__}")
+    # with --check, stdout is reserved for the machine-readable findings
+    log = (lambda *args: print(*args, file=sys.stderr)) if check else print
+    log()
+    log(f"{APP_NAME} {__version__}")
     if version:
         return  # print version number only and exit
 
+    # Import the parser only when needed, to keep --help and -V fast.
+    import wireviz.wireviz as wv
+
     # get list of files
     try:
         _ = iter(file)
@@ -95,6 +186,9 @@ def wireviz(file, format, prepend, output_dir, output_name, version):
             output_formats.append(format_codes[code])
         else:
             raise Exception(f"Unknown output format: {code}")
+    if preview:
+        output_formats = [f for f in output_formats if f not in ("png", "svg", "html")]
+        output_formats.append("preview")
     output_formats = tuple(sorted(set(output_formats)))
     output_formats_str = (
         f'[{"|".join(output_formats)}]'
@@ -109,12 +203,38 @@ def wireviz(file, format, prepend, output_dir, output_name, version):
             prepend_file = Path(prepend_file)
             if not prepend_file.exists():
                 raise Exception(f"File does not exist:\n{prepend_file}")
-            print("Prepend file:", prepend_file)
+            log("Prepend file:", prepend_file)
 
             prepend_input += file_read_text(prepend_file) + "\n"
     else:
         prepend_input = ""
 
+    # register additional colors once for all input files
+    if len(colors) > 0:
+        from wireviz.wv_colors import load_colors
+
+        for colors_file in colors:
+            if not colors_file.exists():
+                raise Exception(f"File does not exist:\n{colors_file}")
+            log("Colors file: ", colors_file)
+            load_colors(colors_file)
+
+    if check:
+        from wireviz.wv_validate import Severity
+
+        errors = False
+        for file in filepaths:
+            findings = check_file(
+                Path(file), prepend_input, prepend, yaml_cache, stream
+            )
+            for finding in findings:
+                print(json.dumps({"file": str(file), **finding.as_dict()}))
+            errors = errors or any(f.severity >= Severity.ERROR for f in findings)
+        sys.exit(1 if errors else 0)
+
+    # share image lookups between input files using the same image paths
+    image_resolvers = {}
+
     # run WireVIz on each input file
     for file in filepaths:
         file = Path(file)
@@ -123,31 +243,270 @@ def wireviz(file, format, prepend, output_dir, output_name, version):
 
         # file_out = file.with_suffix("") if not output_file else output_file
         _output_dir = file.parent if not output_dir else output_dir
-        _output_name = file.stem if not output_name else output_name
+        _output_name = output_name or _input_stem(file)
 
         print("Input file:  ", file)
-        print(
-            "Output file: ", f"{Path(_output_dir / _output_name)}.{output_formats_str}"
-        )
-
-        yaml_input = file_read_text(file)
-        file_dir = file.parent
-
-        yaml_input = prepend_input + yaml_input
-        image_paths = {file_dir}
-        for p in prepend:
-            image_paths.add(Path(p).parent)
-
-        wv.parse(
-            yaml_input,
-            output_formats=output_formats,
-            output_dir=_output_dir,
-            output_name=_output_name,
-            image_paths=list(image_paths),
-        )
+        if not text:
+            print(
+                "Output file: ",
+                f"{Path(_output_dir / _output_name)}.{output_formats_str}",
+            )
+
+        if _is_snapshot(file) or file.suffix.lower() in (".csv", ".tsv"):
+            if _is_snapshot(file):
+                # harness built earlier; re-render without parsing again
+                from wireviz.wv_snapshot import read_snapshot
+
+                harness = read_snapshot(file)
+            else:
+                # tabular wire list; prepended YAML files serve as component library
+                from wireviz.wv_import import import_wire_list
+                from wireviz.wv_yaml import load_yaml
+
+                library = load_yaml(prepend_input) if prepend_input else {}
+                harness = import_wire_list(file, library, title=_output_name)
+            if not text:
+                harness.output(
+                    filename=Path(_output_dir) / _output_name,
+                    fmt=output_formats,
+                    view=False,
+                )
+        else:
+            yaml_input = file_read_text(file)
+            file_dir = file.parent
+
+            yaml_input = prepend_input + yaml_input
+            image_paths = (file_dir, *(Path(p).parent for p in prepend))
+            if image_paths not in image_resolvers:
+                image_resolvers[image_paths] = FileResolver(
+                    list(image_paths), prelist=True
+                )
+
+            harness = wv.parse(
+                yaml_input,
+                return_types="harness" if text else None,
+                output_formats=output_formats if not text else None,
+                output_dir=_output_dir,
+                output_name=_output_name,
+                image_paths=image_resolvers[image_paths],
+                yaml_cache_dir=yaml_cache,
+                stream_connections=stream,
+            )
+        if text:
+            from wireviz.wv_text import harness_text
+
+            print()
+            for line in harness_text(harness):
+                print(line)
 
     print()
 
 
+SNAPSHOT_SUFFIXES = (".harness.json", ".harness.json.gz")
+
+
+def _is_snapshot(file: Path) -> bool:
+    return file.name.lower().endswith(SNAPSHOT_SUFFIXES)
+
+
+def _input_stem(file: Path) -> str:
+    """Return the file name without extension, e.g. mywire for mywire.harness.json."""
+    for suffix in SNAPSHOT_SUFFIXES:
+        if file.name.lower().endswith(suffix):
+            return file.name[: -len(suffix)]
+    return file.stem
+
+
+def check_file(
+    file: Path, prepend_input: str, prepend: tuple, yaml_cache, stream: bool
+) -> list:
+    """Return the validation findings of one input file, without rendering it.
+
+    Errors that prevent building the harness are returned as findings as well.
+    Messages printed while parsing are sent to stderr.
+    """
+    from wireviz.wv_validate import Finding, Severity, validate
+
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if not file.exists():
+                raise Exception(f"File does not exist: {file}")
+            if _is_snapshot(file) or file.suffix.lower() in (".csv", ".tsv"):
+                harness = load_harness(file, prepend_input, prepend)
+                findings = validate(harness)
+                harness.bom()
+                return findings
+            # YAML input; parse() also reports templates that are never used
+            import wireviz.wireviz as wv
+
+            return wv.parse(
+                prepend_input + file_read_text(file),
+                output_name=file.stem,
+                image_paths=[file.parent, *(Path(p).parent for p in prepend)],
+                yaml_cache_dir=yaml_cache,
+                stream_connections=stream,
+                validate_only=True,
+            )
+        except Exception as e:
+            return [Finding(Severity.ERROR, "exception", str(e))]
+
+
+@cli.command(context_settings=dict(help_option_names=["-h", "--help"]))
+@click.argument("old", type=Path)
+@click.argument("new", type=Path)
+@click.option(
+    "-p",
+    "--prepend",
+    default=[],
+    multiple=True,
+    type=Path,
+    help="YAML file to prepend to both input files (optional).",
+)
+def diff(old, new, prepend):
+    """
+    Compares the harnesses of the OLD and NEW input files.
+
+    Added (+), removed (-) and changed (~) connectors, cables, connections,
+    mates and BOM lines are listed. The exit status is 1 if there are differences.
+    """
+    from wireviz.wv_diff import diff_harnesses
+
+    prepend_input = "".join(file_read_text(file) + "\n" for file in prepend)
+    harnesses = [load_harness(file, prepend_input, prepend) for file in (old, new)]
+    changes = diff_harnesses(*harnesses)
+    for change in changes:
+        print(change)
+    sys.exit(1 if changes else 0)
+
+
+@cli.command("bom-merge", context_settings=dict(help_option_names=["-h", "--help"]))
+@click.argument("file", nargs=-1, required=True, type=Path)
+@click.option(
+    "-p",
+    "--prepend",
+    default=[],
+    multiple=True,
+    type=Path,
+    help="YAML file to prepend to all input files (optional).",
+)
+@click.option(
+    "-q",
+    "--qty",
+    default=[],
+    multiple=True,
+    type=str,
+    callback=lambda ctx, param, value: [_parse_qty(item) for item in value],
+    help="Number of harnesses needed, as NAME=QTY with the input file name "
+    "(without extension) as NAME. Default = 1.",
+)
+@click.option(
+    "-o",
+    "--output",
+    default=None,
+    type=Path,
+    help="Output file; the extension selects the format (.tsv, .csv or .jsonl). "
+    "Default = TSV on stdout.",
+)
+@click.option(
+    "--parallel",
+    is_flag=True,
+    default=False,
+    help="Build the BOMs of the input files in parallel processes.",
+)
+def bom_merge(file, prepend, qty, output, parallel):
+    """
+    Builds the BOMs of all FILE inputs and merges them into one project BOM.
+
+    Equal parts are joined, and designators are prefixed with the harness name.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from wireviz.wv_bom import (
+        bom_list,
+        merge_boms,
+        write_bom_csv,
+        write_bom_jsonl,
+        write_bom_tsv,
+    )
+
+    names = [_input_stem(path) for path in file]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise Exception(f"Harness names are not unique: {', '.join(duplicates)}")
+    multipliers = dict.fromkeys(names, 1)
+    for name, number in qty:
+        if name not in multipliers:
+            raise click.BadParameter(
+                f"unknown harness name {name!r}", param_hint="'-q' / '--qty'"
+            )
+        multipliers[name] = number
+
+    prepend_input = "".join(file_read_text(path) + "\n" for path in prepend)
+    jobs = [(path, prepend_input, prepend) for path in file]
+    if parallel and len(jobs) > 1:
+        # parsing is done in Python, so use processes rather than threads
+        with ProcessPoolExecutor() as pool:
+            boms = list(pool.map(_harness_bom, jobs))
+    else:
+        boms = [_harness_bom(job) for job in jobs]
+    bomlist = bom_list(
+        merge_boms(zip(names, boms, (multipliers[name] for name in names)))
+    )
+
+    if output is None:
+        write_bom_tsv(sys.stdout, bomlist)
+        return
+    suffix = output.suffix.lower()
+    writers = {".tsv": write_bom_tsv, ".csv": write_bom_csv, ".jsonl": write_bom_jsonl}
+    if suffix not in writers:
+        raise Exception(f"Unknown BOM output format: {output}")
+    with open_file_write(output, newline="" if suffix == ".csv" else None) as f:
+        writers[suffix](f, bomlist)
+
+
+def _parse_qty(item: str) -> Tuple[str, Union[int, float]]:
+    """Return the harness name and quantity of a NAME=QTY option value."""
+    name, _, number = item.rpartition("=")
+    try:
+        if not name:
+            raise ValueError
+        qty = float(number) if "." in number else int(number)
+    except ValueError:
+        raise click.BadParameter(
+            f"{item!r} is not of the form NAME=QTY with a numeric QTY",
+            param_hint="'-q' / '--qty'",
+        ) from None
+    return name, qty
+
+
+def load_harness(file: Path, prepend_input: str = "", prepend: tuple = ()):
+    """Return the harness of a YAML file, wire list or snapshot, without any output."""
+    if not file.exists():
+        raise Exception(f"File does not exist:\n{file}")
+    if _is_snapshot(file):
+        from wireviz.wv_snapshot import read_snapshot
+
+        return read_snapshot(file)
+    if file.suffix.lower() in (".csv", ".tsv"):
+        from wireviz.wv_import import import_wire_list
+        from wireviz.wv_yaml import load_yaml
+
+        library = load_yaml(prepend_input) if prepend_input else {}
+        return import_wire_list(file, library)
+    import wireviz.wireviz as wv
+
+    return wv.parse(
+        prepend_input + file_read_text(file),
+        return_types="harness",
+        output_name=_input_stem(file),
+        image_paths=[file.parent, *(Path(p).parent for p in prepend)],
+    )
+
+
+def _harness_bom(job: tuple) -> list:
+    with contextlib.redirect_stdout(sys.stderr):  # keep stdout for the BOM
+        return load_harness(*job).bom()
+
+
 if __name__ == "__main__":
-    wireviz()
+    cli()
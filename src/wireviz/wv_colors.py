@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from typing import Dict, List
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
 COLOR_CODES = {
     # fmt: off
@@ -128,17 +130,43 @@ ColorMode = (
 ColorScheme = str  # Color scheme name = Literal[COLOR_CODES.keys()]
 
 
+# reverse lookup of color names, built from _color_hex by _update_hex_index()
+_hex_color: Dict[str, Color] = {}
+
+_warned = set()  # print warnings about each invalid color only once
+
+
+def _warn_once(message: str) -> None:
+    if message not in _warned:
+        _warned.add(message)
+        print(message)
+
+
+def _update_hex_index() -> None:
+    _hex_color.clear()
+    for color, hex in _color_hex.items():
+        _hex_color.setdefault(hex, color)  # first color name wins, as before
+
+
+_update_hex_index()
+
+
 def get_color_hex(input: Colors, pad: bool = False) -> List[str]:
     """Return list of hex colors from either a string of color names or :-separated hex colors."""
+    return list(_get_color_hex(input, pad))
+
+
+@lru_cache(maxsize=1024)
+def _get_color_hex(input: Colors, pad: bool) -> Tuple[str, ...]:
     if input is None or input == "":
-        return [color_default]
+        return (color_default,)
     elif input[0] == "#":  # Hex color(s)
         output = input.split(":")
         for i, c in enumerate(output):
             if c[0] != "#" or not all(d in _hex_digits for d in c[1:]):
                 if c != input:
                     c += f" in input: {input}"
-                print(f"Invalid hex color: {c}")
+                _warn_once(f"Invalid hex color: {c}")
                 output[i] = color_default
     else:  # Color name(s)
 
@@ -148,7 +176,7 @@ def get_color_hex(input: Colors, pad: bool = False) -> List[str]:
             except KeyError:
                 if c != input:
                     c += f" in input: {input}"
-                print(f"Unknown color name: {c}")
+                _warn_once(f"Unknown color name: {c}")
                 return color_default
 
         output = [lookup(input[i : i + 2]) for i in range(0, len(input), 2)]
@@ -158,16 +186,16 @@ def get_color_hex(input: Colors, pad: bool = False) -> List[str]:
     elif pad and len(output) == 1:  # Hacky style fix: Give single color wires
         output *= 3  #              a triple-up so that wires are the same size
 
-    return output
+    return tuple(output)
 
 
 def get_color_translation(translate: Dict[Color, str], input: Colors) -> List[str]:
     """Return list of colors translations from either a string of color names or :-separated hex colors."""
 
     def from_hex(hex_input: str) -> str:
-        for color, hex in _color_hex.items():
-            if hex == hex_input:
-                return translate[color]
+        color = _hex_color.get(hex_input)
+        if color is not None:
+            return translate[color]
         return f'({",".join(str(int(hex_input[i:i+2], 16)) for i in range(1, 6, 2))})'
 
     return (
@@ -177,6 +205,7 @@ def get_color_translation(translate: Dict[Color, str], input: Colors) -> List[st
     )
 
 
+@lru_cache(maxsize=1024)
 def translate_color(input: Colors, color_mode: ColorMode) -> str:
     if input == "" or input is None:
         return ""
@@ -188,7 +217,7 @@ def translate_color(input: Colors, color_mode: ColorMode) -> str:
     if color_mode == "full":
         output = "/".join(get_color_translation(_color_full, input))
     elif color_mode == "hex":
-        output = ":".join(get_color_hex(input, pad=False))
+        output = ":".join(_get_color_hex(input, pad=False))
     elif color_mode == "ger":
         output = "".join(get_color_translation(_color_ger, input))
     elif color_mode == "short":
@@ -199,3 +228,56 @@ def translate_color(input: Colors, color_mode: ColorMode) -> str:
         return output.upper()
     else:
         return output.lower()
+
+
+def register_colors(
+    colors: Optional[Dict[Color, Union[str, Dict[str, str]]]] = None,
+    color_codes: Optional[Dict[ColorScheme, List[Colors]]] = None,
+) -> None:
+    """Add colors and color codes to the ones understood by WireViz.
+
+    A color is given either by its hex value, or as a dict with the keys
+    hex (required), full and ger. Existing colors and color codes can be
+    redefined.
+    """
+    for color, definition in (colors or {}).items():
+        if not isinstance(definition, dict):
+            definition = {"hex": definition}
+        hex = str(definition.get("hex", ""))
+        if not isinstance(color, str) or len(color) != 2 or not color.isupper():
+            raise Exception(f"Color names must be two uppercase letters: {color}")
+        if len(hex) != 7 or hex[0] != "#" or not all(d in _hex_digits for d in hex[1:]):
+            raise Exception(f"Invalid hex color for {color}: {hex}")
+        _color_hex[color] = hex.lower()
+        _color_full[color] = str(definition.get("full", color.lower()))
+        _color_ger[color] = str(definition.get("ger", color.lower()))
+    for scheme, code in (color_codes or {}).items():
+        if not isinstance(code, list) or not code:
+            raise Exception(f"Color code {scheme} must be a non-empty list of colors")
+        for entry in code:
+            if not isinstance(entry, str) or not all(
+                entry[i : i + 2] in _color_hex for i in range(0, len(entry), 2)
+            ):
+                raise Exception(f"Unknown color {entry} in color code {scheme}")
+        COLOR_CODES[scheme] = list(code)
+
+    _update_hex_index()
+    _get_color_hex.cache_clear()
+    translate_color.cache_clear()
+
+
+def load_colors(filename: Union[str, Path]) -> None:
+    """Register the colors and color codes defined in a YAML file.
+
+    The file may contain the top-level keys colors and color_codes,
+    see register_colors().
+    """
+    from wireviz.wv_helper import file_read_text
+    from wireviz.wv_yaml import load_yaml
+
+    data = load_yaml(file_read_text(filename)) or {}
+    if not isinstance(data, dict) or not set(data) <= {"colors", "color_codes"}:
+        raise Exception(
+            f"{filename}: Expected a mapping with the keys colors and/or color_codes"
+        )
+    register_colors(data.get("colors"), data.get("color_codes"))
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Sequence, Union
+
+from wireviz.DataClasses import Designator, Pin, Wire
+from wireviz.wv_helper import expand, is_arrow
+
+ComponentKind = Enum("ComponentKind", "CONNECTOR CABLE ARROW")
+
+# connection sets must alternate between these two groups of components
+ALTERNATING_TYPES = {
+    ComponentKind.CONNECTOR: "connector",
+    ComponentKind.CABLE: "cable/arrow",
+    ComponentKind.ARROW: "cable/arrow",
+}
+
+
+@dataclass
+class ConnectionColumn:
+    """One entry of a connection set, with one designator id and pin per connection."""
+
+    ids: array  # indices into the designator table of the compiler
+    pins: Sequence[Union[Pin, Wire]]  # may contain lazy ranges, see expand()
+
+
+@dataclass
+class CompiledConnectionSet:
+    """A validated connection set, stored column by column."""
+
+    designators: List[Designator]  # designator table shared between all sets
+    kinds: List[ComponentKind]  # component kind per designator id
+    columns: List[ConnectionColumn]
+    count: int  # number of parallel connections in the set
+    # ids of components referenced for the first time, in order of appearance
+    new_ids: List[int] = field(default_factory=list)
+
+
+class ConnectionSetCompiler:
+    """Compile connection sets from the YAML input into CompiledConnectionSet objects.
+
+    Designators are numbered in order of first appearance, and the table of
+    designators, templates, and component kinds is shared between all sets
+    compiled by the same compiler.
+    """
+
+    def __init__(
+        self,
+        template_connectors: Dict[str, dict],
+        template_cables: Dict[str, dict],
+        template_separator: str,
+    ):
+        self.template_connectors = template_connectors
+        self.template_cables = template_cables
+        self.separator = template_separator
+        self.designators: List[Designator] = []
+        self.templates: List[str] = []
+        self.kinds: List[ComponentKind] = []
+        self._ids: Dict[Designator, int] = {}
+        self._types: List[str] = []  # alternating type per designator id
+        # keep track of auto-generated designators to avoid duplicates
+        self._autogenerated: Dict[str, int] = {}
+
+    def compile(self, connection_set: list) -> CompiledConnectionSet:
+        """Return the compiled connection set or raise exception if invalid."""
+        # expand all pin lists
+        pinlists = []
+        for entry in connection_set:
+            if isinstance(entry, str):
+                pinlists.append(None)  # strings do not reveal connection count
+            elif isinstance(entry, list):
+                pinlists.append([1] * len(entry))
+            elif isinstance(entry, dict):
+                pinlists.append(expand(next(iter(entry.values()))))
+                # e.g.: - X1: [1-4,6] yields 5
+            else:
+                raise Exception(f"Unexpected entry in connection set: {entry}")
+
+        # figure out number of parallel connections within this set
+        counts = [len(pins) for pins in pinlists if pins is not None]
+        if not any(counts):
+            # no item in the list revealed connection count;
+            # assume connection count is 1
+            count = 1
+            # Example: The following is a valid connection set,
+            #          even though no item reveals the connection count;
+            #          the count is not needed because only a component-level mate happens.
+            # -
+            #   - CONNECTOR
+            #   - ==>
+            #   - CONNECTOR
+        elif len(set(counts)) > 1:
+            raise Exception(
+                "All items in connection set must reference the same number of connections"
+            )
+        else:
+            count = counts[0]
+
+        # resolve all designators
+        new_ids = []
+        columns = []
+        for entry, pins in zip(connection_set, pinlists):
+            if isinstance(entry, str):  # one instance per connection
+                ids = array("l", (self._lookup(entry, new_ids) for _ in range(count)))
+                pins = [1] * count
+            elif isinstance(entry, list):
+                ids = array("l", (self._lookup(item, new_ids) for item in entry))
+            else:  # dict
+                id = self._lookup(next(iter(entry.keys())), new_ids)
+                ids = array("l", [id] * len(pins))
+            columns.append(ConnectionColumn(ids, pins))
+        if columns:
+            # connections are made for the shortest entry
+            count = min(len(column.pins) for column in columns)
+
+        self._check_alternating(columns)
+
+        return CompiledConnectionSet(
+            designators=self.designators,
+            kinds=self.kinds,
+            columns=columns,
+            count=count,
+            new_ids=new_ids,
+        )
+
+    def _lookup(self, inp: str, new_ids: List[int]) -> int:
+        """Return id of the designator referenced by inp, registering it if new."""
+        if self.separator in inp:  # generate a new instance of an item
+            if inp.count(self.separator) > 1:
+                raise Exception(
+                    f"{inp} - Found more than one separator ({self.separator})"
+                )
+            template, designator = inp.split(self.separator)
+            if designator == "":
+                self._autogenerated[template] = self._autogenerated.get(template, 0) + 1
+                designator = f"__{template}_{self._autogenerated[template]}"
+            # check if redefining existing component to different template
+            id = self._ids.get(designator)
+            if id is not None and self.templates[id] != template:
+                raise Exception(
+                    f"Trying to redefine {designator} from {self.templates[id]} to {template}"
+                )
+        else:
+            template, designator = (inp, inp)
+            id = self._ids.get(designator)
+        if id is None:  # first reference to this component
+            kind = self._kind(designator, template)
+            id = len(self.designators)
+            self._ids[designator] = id
+            self.designators.append(designator)
+            self.templates.append(template)
+            self.kinds.append(kind)
+            self._types.append(ALTERNATING_TYPES[kind])
+            # arrows are not generated as components
+            if kind is not ComponentKind.ARROW:
+                new_ids.append(id)
+        return id
+
+    def _kind(self, designator: Designator, template: str) -> ComponentKind:
+        if template in self.template_connectors:
+            return ComponentKind.CONNECTOR
+        elif template in self.template_cables:
+            return ComponentKind.CABLE
+        elif is_arrow(designator):
+            return ComponentKind.ARROW
+        else:
+            raise Exception(f"{template} is an unknown template/designator/arrow.")
+
+    def _check_alternating(self, columns: List[ConnectionColumn]) -> None:
+        # each connection set may start with either type
+        expected_type = None
+        for index, column in enumerate(columns):
+            for id in dict.fromkeys(column.ids):  # each distinct component once
+                actual_type = self._types[id]
+                if not expected_type:
+                    expected_type = actual_type
+                if actual_type != expected_type:  # did not alternate
+                    raise Exception(
+                        f'Expected {expected_type}, but "{self.designators[id]}" ("{self.templates[id]}") is {actual_type}'
+                    )
+                if self.kinds[id] is ComponentKind.ARROW:
+                    if index == 0:
+                        raise Exception(
+                            "An arrow cannot be at the start of a connection set"
+                        )
+                    elif index == len(columns) - 1:
+                        raise Exception(
+                            "An arrow cannot be at the end of a connection set"
+                        )
+            # entries in connection set must alternate between connectors and cables/arrows
+            if expected_type:
+                expected_type = (
+                    "cable/arrow" if expected_type == "connector" else "connector"
+                )
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+from dataclasses import dataclass, field, fields
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
+
+from wireviz.DataClasses import MatePin
+from wireviz.wv_bom import bom_entry_key
+
+if TYPE_CHECKING:
+    from wireviz.Harness import Harness
+
+ADDED = "+"
+REMOVED = "-"
+CHANGED = "~"
+
+
+@dataclass
+class Change:
+    kind: str  # ADDED, REMOVED or CHANGED
+    category: str  # connector, cable, connection, mate or bom
+    key: str
+    fields: List[Tuple[str, Any, Any]] = field(default_factory=list)  # changed only
+
+    def __str__(self) -> str:
+        text = f"{self.kind} {self.category} {self.key}"
+        if self.fields:
+            text += ": " + "; ".join(
+                f"{name} {old!r} -> {new!r}" for name, old, new in self.fields
+            )
+        return text
+
+
+def diff_harnesses(old: "Harness", new: "Harness") -> List[Change]:
+    """Return the differences between two harnesses, compared by key.
+
+    Connectors and cables are matched by designator, connections by cable,
+    wire and both ends, mates by their ends, and BOM lines by the BOM key
+    (description, unit and part numbers). Each part is compared in linear
+    time, and no diagram is created.
+    """
+    changes = []
+    changes.extend(_diff_components("connector", old.connectors, new.connectors))
+    changes.extend(_diff_components("cable", old.cables, new.cables))
+    changes.extend(_diff_counted("connection", _connections(old), _connections(new)))
+    changes.extend(_diff_keyed("mate", _mates(old), _mates(new)))
+    changes.extend(_diff_keyed("bom", _bom_lines(old), _bom_lines(new)))
+    return changes
+
+
+def _diff_components(
+    category: str, old: Dict[str, Any], new: Dict[str, Any]
+) -> Iterator[Change]:
+    for name, component in old.items():
+        if name not in new:
+            yield Change(REMOVED, category, name)
+            continue
+        other = new[name]
+        changed = [
+            (f.name, getattr(component, f.name), getattr(other, f.name))
+            for f in fields(component)
+            if getattr(component, f.name) != getattr(other, f.name)
+        ]
+        if changed:
+            yield Change(CHANGED, category, name, changed)
+    for name in new:
+        if name not in old:
+            yield Change(ADDED, category, name)
+
+
+def _diff_counted(category: str, old: Counter, new: Counter) -> Iterator[Change]:
+    """Yield a change for each key that is more (or less) frequent in new than in old."""
+    for key, count in (old - new).items():
+        for _ in range(count):
+            yield Change(REMOVED, category, key)
+    for key, count in (new - old).items():
+        for _ in range(count):
+            yield Change(ADDED, category, key)
+
+
+def _diff_keyed(
+    category: str, old: Dict[str, Dict[str, Any]], new: Dict[str, Dict[str, Any]]
+) -> Iterator[Change]:
+    for key, values in old.items():
+        if key not in new:
+            yield Change(REMOVED, category, key)
+            continue
+        changed = [
+            (name, value, new[key].get(name))
+            for name, value in values.items()
+            if value != new[key].get(name)
+        ]
+        if changed:
+            yield Change(CHANGED, category, key, changed)
+    for key in new:
+        if key not in old:
+            yield Change(ADDED, category, key)
+
+
+def _end(name: Optional[str], pin: Any) -> str:
+    return "(none)" if name is None else f"{name}:{pin}"
+
+
+def _connections(harness: "Harness") -> Counter:
+    return Counter(
+        f"{cable.name}:{c.via_port} {_end(c.from_name, c.from_pin)}"
+        f" -> {_end(c.to_name, c.to_pin)}"
+        for cable in harness.cables.values()
+        for c in cable.connections
+    )
+
+
+def _mates(harness: "Harness") -> Dict[str, Dict[str, Any]]:
+    mates = {}
+    for mate in harness.mates:
+        if isinstance(mate, MatePin):
+            key = f"{mate.from_name}:{mate.from_pin} {mate.to_name}:{mate.to_pin}"
+        else:
+            key = f"{mate.from_name} {mate.to_name}"
+        mates[key] = {"shape": mate.shape}
+    return mates
+
+
+def _bom_lines(harness: "Harness") -> Dict[str, Dict[str, Any]]:
+    return {
+        " | ".join(part for part in bom_entry_key(entry) if part): {
+            "qty": entry["qty"],
+            "designators": entry["designators"],
+        }
+        for entry in harness.bom()
+    }
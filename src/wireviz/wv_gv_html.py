@@ -3,8 +3,7 @@
 import re
 from typing import List, Optional, Union
 
-from wireviz.DataClasses import Color
-from wireviz.wv_colors import translate_color
+from wireviz.wv_colors import Color, translate_color
 from wireviz.wv_helper import remove_links
 
 
@@ -65,8 +64,6 @@ def html_colorbar(color: Color) -> str:
 
 
 def html_image(image):
-    from wireviz.DataClasses import Image
-
     if not image:
         return None
     # The leading attributes belong to the preceeding tag. See where used below.
@@ -83,8 +80,6 @@ def html_image(image):
 
 
 def html_caption(image):
-    from wireviz.DataClasses import Image
-
     return (
         f'<tdX sides="BLR"{html_bgcolor_attr(image.bgcolor)}>{html_line_breaks(image.caption)}'
         if image and image.caption
@@ -93,8 +88,6 @@ def html_caption(image):
 
 
 def html_size_attr(image):
-    from wireviz.DataClasses import Image
-
     # Return Graphviz HTML attributes to specify minimum or fixed size of a TABLE or TD object
     return (
         (
@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
 
+import os
 import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import accumulate, chain
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Set, Union
 
 awg_equiv_table = {
     "0.09": "28",
@@ -34,39 +38,94 @@ def mm2_equiv(awg):
     return mm2_equiv_table.get(str(awg), "Unknown")
 
 
-def expand(yaml_data):
+class RangeList(Sequence):
+    """Read-only sequence of single items and inclusive int ranges, expanded lazily.
+
+    Length and membership tests of ints do not iterate over the ranges.
+    """
+
+    def __init__(self, segments: List[Union[range, tuple]]):
+        self._segments = segments  # range objects, or tuples of single items
+        self._ends = list(accumulate(len(segment) for segment in segments))
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+    def __iter__(self) -> Iterator:
+        return chain.from_iterable(self._segments)
+
+    def __contains__(self, item) -> bool:
+        for segment in self._segments:
+            if isinstance(segment, range):
+                # range objects only test ints without iterating
+                if isinstance(item, int) and item in segment:
+                    return True
+            elif item in segment:
+                return True
+        return False
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("RangeList index out of range")
+        if len(self._segments) == 1:
+            return self._segments[0][index]
+        position = bisect_right(self._ends, index)
+        offset = self._ends[position - 1] if position else 0
+        return self._segments[position][index - offset]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (RangeList, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RangeList({self._segments!r})"
+
+
+def expand(yaml_data) -> RangeList:
     # yaml_data can be:
     # - a singleton (normally str or int)
     # - a list of str or int
-    # if str is of the format '#-#', it is treated as a range (inclusive) and expanded
-    output = []
+    # if str is of the format '#-#', it is treated as a range (inclusive),
+    # which is kept as a range object instead of being expanded
+    segments = []
+    singles = []  # consecutive single items, collected into one segment
     if not isinstance(yaml_data, list):
         yaml_data = [yaml_data]
     for e in yaml_data:
+        if type(e) is int:  # no need for a round trip through str
+            singles.append(e)
+            continue
         e = str(e)
         if "-" in e:
             a, b = e.split("-", 1)
             try:
                 a = int(a)
                 b = int(b)
-                if a < b:
-                    for x in range(a, b + 1):
-                        output.append(x)  # ascending range
-                elif a > b:
-                    for x in range(a, b - 1, -1):
-                        output.append(x)  # descending range
-                else:  # a == b
-                    output.append(a)  # range of length 1
-            except:
+            except ValueError:
                 # '-' was not a delimiter between two ints, pass e through unchanged
-                output.append(e)
+                singles.append(e)
+                continue
+            if singles:
+                segments.append(tuple(singles))
+                singles = []
+            if a <= b:
+                segments.append(range(a, b + 1))  # ascending range, or length 1
+            else:
+                segments.append(range(a, b - 1, -1))  # descending range
         else:
             try:
                 x = int(e)  # single int
-            except Exception:
+            except ValueError:
                 x = e  # string
-            output.append(x)
-    return output
+            singles.append(x)
+    if singles:
+        segments.append(tuple(singles))
+    return RangeList(segments)
 
 
 def get_single_key_and_value(d: dict):
@@ -91,21 +150,20 @@ def flatten2d(inp):
 
 
 def tuplelist2tsv(inp, header=None):
-    output = ""
     if header is not None:
-        inp.insert(0, header)
-    inp = flatten2d(inp)
-    for row in inp:
-        output = output + "\t".join(str(remove_links(item)) for item in row) + "\n"
-    return output
+        inp = [header, *inp]
+    return "".join(
+        "\t".join(str(remove_links(item)) for item in row) + "\n"
+        for row in flatten2d(inp)
+    )
+
+
+# Hyperlinks are removed by keeping the link text only
+_link_pattern = re.compile(r"<[aA] [^>]*>([^<]*)</[aA]>")
 
 
 def remove_links(inp):
-    return (
-        re.sub(r"<[aA] [^>]*>([^<]*)</[aA]>", r"\1", inp)
-        if isinstance(inp, str)
-        else inp
-    )
+    return _link_pattern.sub(r"\1", inp) if isinstance(inp, str) else inp
 
 
 def clean_whitespace(inp):
@@ -118,9 +176,9 @@ def open_file_read(filename):
     return open(filename, "r", encoding="UTF-8")
 
 
-def open_file_write(filename):
+def open_file_write(filename, newline=None):
     """Open utf-8 encoded text file for writing - remember closing it when finished"""
-    return open(filename, "w", encoding="UTF-8")
+    return open(filename, "w", encoding="UTF-8", newline=newline)
 
 
 def open_file_append(filename):
@@ -138,6 +196,10 @@ def file_write_text(filename: str, text: str) -> int:
     return Path(filename).write_text(text, encoding="utf-8")
 
 
+# regex by @shiraneyo
+_arrow_pattern = re.compile(r"^\s*(?P<leftHead><?)(?P<body>-+|=+)(?P<rightHead>>?)\s*$")
+
+
 def is_arrow(inp):
     """
     Matches strings of one or multiple `-` or `=` (but not mixed)
@@ -147,10 +209,7 @@ def is_arrow(inp):
       <-, --, ->, <->
       <==, ==, ==>, <=>
     """
-    # regex by @shiraneyo
-    return bool(
-        re.match(r"^\s*(?P<leftHead><?)(?P<body>-+|=+)(?P<rightHead>>?)\s*$", inp)
-    )
+    return bool(_arrow_pattern.match(inp))
 
 
 def aspect_ratio(image_src):
@@ -167,25 +226,86 @@ def aspect_ratio(image_src):
     return 1  # Assume 1:1 when unable to read actual image size
 
 
-def smart_file_resolve(filename: str, possible_paths: (str, List[str])) -> Path:
-    if not isinstance(possible_paths, List):
-        possible_paths = [possible_paths]
-    filename = Path(filename)
-    if filename.is_absolute():
-        if filename.exists():
-            return filename
-        else:
-            raise Exception(f"{filename} does not exist.")
-    else:  # search all possible paths in decreasing order of precedence
-        possible_paths = [
-            Path(path).resolve() for path in possible_paths if path is not None
-        ]
-        for possible_path in possible_paths:
+class FileResolver:
+    """Resolve relative file names against an ordered list of search paths.
+
+    The search paths are normalized once when added, and every lookup is
+    memoized, so repeated references to the same file only touch the file
+    system once. With prelist=True, the contents of each search directory are
+    listed once up front, and plain file names are looked up in these listings
+    instead of checking every candidate path for existence.
+    Call invalidate() when files might have been added, moved, or deleted.
+    """
+
+    def __init__(
+        self,
+        possible_paths: Union[str, Path, List[Union[str, Path]], None] = None,
+        prelist: bool = False,
+    ):
+        self.paths: List[Path] = []
+        self.prelist = prelist
+        self._resolved: Dict[str, Optional[Path]] = {}
+        self._listings: Dict[Path, Optional[Set[str]]] = {}
+        if possible_paths is not None:
+            if not isinstance(possible_paths, List):
+                possible_paths = [possible_paths]
+            for path in possible_paths:
+                self.add_path(path)
+
+    def add_path(self, path: Union[str, Path, None]) -> None:
+        """Append a search path with lower precedence than the existing ones."""
+        if path is None:
+            return
+        path = Path(path).resolve()
+        if path not in self.paths:
+            self.paths.append(path)
+            self._resolved = {k: v for k, v in self._resolved.items() if v}
+
+    def invalidate(self) -> None:
+        """Forget all memoized lookups and directory listings."""
+        self._resolved.clear()
+        self._listings.clear()
+
+    def _listing(self, path: Path) -> Optional[Set[str]]:
+        if path not in self._listings:
+            try:
+                self._listings[path] = set(os.listdir(path))
+            except OSError:
+                self._listings[path] = None  # not a readable directory
+        return self._listings[path]
+
+    def _search(self, filename: Path) -> Optional[Path]:
+        # search all possible paths in decreasing order of precedence
+        plain_name = self.prelist and len(filename.parts) == 1
+        for possible_path in self.paths:
+            if plain_name:
+                listing = self._listing(possible_path)
+                if listing is None or filename.name not in listing:
+                    continue
             resolved_path = (possible_path / filename).resolve()
             if resolved_path.exists():
                 return resolved_path
-        else:
-            raise Exception(
-                f"{filename} was not found in any of the following locations: \n"
-                + "\n".join([str(x) for x in possible_paths])
-            )
+        return None
+
+    def resolve(self, filename: Union[str, Path]) -> Path:
+        """Return the resolved path of filename or raise exception if not found."""
+        key = str(filename)
+        if key not in self._resolved:
+            filename = Path(filename)
+            if filename.is_absolute():
+                self._resolved[key] = filename if filename.exists() else None
+            else:
+                self._resolved[key] = self._search(filename)
+        resolved_path = self._resolved[key]
+        if resolved_path is not None:
+            return resolved_path
+        if Path(filename).is_absolute():
+            raise Exception(f"{filename} does not exist.")
+        raise Exception(
+            f"{filename} was not found in any of the following locations: \n"
+            + "\n".join([str(x) for x in self.paths])
+        )
+
+
+def smart_file_resolve(filename: str, possible_paths: (str, List[str])) -> Path:
+    return FileResolver(possible_paths).resolve(filename)
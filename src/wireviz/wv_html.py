@@ -2,7 +2,7 @@
 
 import re
 from pathlib import Path
-from typing import Callable, Dict, List, Union
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
 from wireviz import APP_NAME, APP_URL, __version__, wv_colors
 from wireviz.DataClasses import Metadata, Options
@@ -15,13 +15,92 @@ from wireviz.wv_helper import (
     smart_file_resolve,
 )
 
+# Placeholders in HTML templates look like <!-- %title% -->
+TEMPLATE_PLACEHOLDER = re.compile(r"(<!-- %[^%]*% -->)")
+SVG_DECLARATIONS = re.compile("^<[?]xml [^?>]*[?]>[^<]*<!DOCTYPE [^>]*>")
+BODY_START = re.compile(r"<body[^>]*>", re.IGNORECASE)
+# unit suffix of a BOM header, e.g. " [g]", left out of its CSS class name
+HEADER_UNIT = re.compile(r"\s*\[[^\]]*\]$")
+PAGE_BREAK = '\n<div style="break-after: page; page-break-after: always"></div>\n'
+
+
+class HTMLTemplate:
+    """HTML template pre-parsed into literal text and placeholder segments."""
+
+    def __init__(self, text: str):
+        # Splitting on a capturing group yields literal text at even indices
+        # and placeholders at odd indices.
+        self.segments = TEMPLATE_PLACEHOLDER.split(text)
+        self.placeholders = set(self.segments[1::2])
+
+    def render(self, replacements: Dict[str, str]) -> str:
+        """Return the template text with all known placeholders replaced."""
+        segments = self.segments.copy()
+        for i in range(1, len(segments), 2):
+            segments[i] = replacements.get(segments[i], segments[i])
+        return "".join(segments)
+
+
+# cache of parsed templates: path -> (modification time, template)
+_template_cache: Dict[Path, Tuple[int, HTMLTemplate]] = {}
+
+
+def load_template(templatefile: Union[str, Path]) -> HTMLTemplate:
+    """Return the parsed template, only reading the file again if it has changed."""
+    templatefile = Path(templatefile)
+    mtime = templatefile.stat().st_mtime_ns
+    cached = _template_cache.get(templatefile)
+    if cached is None or cached[0] != mtime:
+        # TODO?: Warn if unexpected meta charset?
+        cached = (mtime, HTMLTemplate(file_read_text(templatefile)))
+        _template_cache[templatefile] = cached
+    return cached[1]
+
+
+def html_table_row(tag: str, classes: Sequence[str], items: Sequence[str]) -> str:
+    """Return a HTML table row with one cell of the given tag per item."""
+    cells = "".join(
+        f'    <{tag} class="{cls}">{item}</{tag}>\n'
+        for cls, item in zip(classes, items)
+    )
+    return f"  <tr>\n{cells}  </tr>\n"
+
+
+def body_span(page: str) -> Tuple[int, int]:
+    """Return start and end index of the contents of the body element."""
+    start = BODY_START.search(page)
+    end = page.lower().rfind("</body>")
+    if not start or end < 0:
+        raise Exception("HTML template must contain <body> tags for multiple sheets")
+    return start.end(), end
+
+
+def combine_pages(pages: List[str]) -> str:
+    """Return one HTML document with the bodies of all pages, separated by page breaks."""
+    if len(pages) == 1:
+        return pages[0]
+    bodies = []
+    for page in pages:
+        start, end = body_span(page)
+        bodies.append(page[start:end])
+    start, end = body_span(pages[0])
+    return pages[0][:start] + PAGE_BREAK.join(bodies) + pages[0][end:]
+
 
 def generate_html_output(
     filename: Union[str, Path],
     bom_list: List[List[str]],
     metadata: Metadata,
     options: Options,
+    diagrams: Optional[List[Union[str, Path]]] = None,
 ):
+    """Write the HTML output, with one page per diagram file name (without extension).
+
+    The BOM is only shown on the first page.
+    """
+    if diagrams is None:
+        diagrams = [filename]
+
     # load HTML template
     templatename = metadata.get("template", {}).get("name")
     if templatename:
@@ -34,46 +113,43 @@ def generate_html_output(
         # fall back to built-in simple template if no template was provided
         templatefile = Path(__file__).parent / "templates/simple.html"
 
-    html = file_read_text(templatefile)  # TODO?: Warn if unexpected meta charset?
+    template = load_template(templatefile)
 
     # embed SVG diagram (only if used)
-    def svgdata() -> str:
-        return re.sub(  # TODO?: Verify xml encoding="utf-8" in SVG?
-            "^<[?]xml [^?>]*[?]>[^<]*<!DOCTYPE [^>]*>",
+    def svgdata(diagram: Union[str, Path]) -> str:
+        return SVG_DECLARATIONS.sub(  # TODO?: Verify xml encoding="utf-8" in SVG?
             "<!-- XML and DOCTYPE declarations from SVG file removed -->",
-            file_read_text(f"{filename}.tmp.svg"),
+            file_read_text(f"{diagram}.tmp.svg"),
             1,
         )
 
     # generate BOM table
     bom = flatten2d(bom_list)
+    bom_classes = [
+        "bom_col_" + "_".join(HEADER_UNIT.sub("", item).lower().split())
+        for item in bom[0]
+    ]
 
     # generate BOM header (may be at the top or bottom of the table)
-    bom_header_html = "  <tr>\n"
-    for item in bom[0]:
-        th_class = f"bom_col_{item.lower()}"
-        bom_header_html = f'{bom_header_html}    <th class="{th_class}">{item}</th>\n'
-    bom_header_html = f"{bom_header_html}  </tr>\n"
+    bom_header_html = html_table_row("th", bom_classes, bom[0])
 
     # generate BOM contents
-    bom_contents = []
-    for row in bom[1:]:
-        row_html = "  <tr>\n"
-        for i, item in enumerate(row):
-            td_class = f"bom_col_{bom[0][i].lower()}"
-            row_html = f'{row_html}    <td class="{td_class}">{item}</td>\n'
-        row_html = f"{row_html}  </tr>\n"
-        bom_contents.append(row_html)
-
-    bom_html = (
-        '<table class="bom">\n' + bom_header_html + "".join(bom_contents) + "</table>\n"
-    )
-    bom_html_reversed = (
-        '<table class="bom">\n'
-        + "".join(list(reversed(bom_contents)))
-        + bom_header_html
-        + "</table>\n"
-    )
+    bom_contents = [html_table_row("td", bom_classes, row) for row in bom[1:]]
+
+    def bom_html() -> str:
+        return "".join(
+            ['<table class="bom">\n', bom_header_html, *bom_contents, "</table>\n"]
+        )
+
+    def bom_html_reversed() -> str:
+        return "".join(
+            [
+                '<table class="bom">\n',
+                *reversed(bom_contents),
+                bom_header_html,
+                "</table>\n",
+            ]
+        )
 
     # prepare simple replacements
     replacements = {
@@ -82,24 +158,21 @@ def generate_html_output(
         "<!-- %bgcolor% -->": wv_colors.translate_color(options.bgcolor, "hex"),
         "<!-- %filename% -->": str(filename),
         "<!-- %filename_stem% -->": Path(filename).stem,
-        "<!-- %bom% -->": bom_html,
-        "<!-- %bom_reversed% -->": bom_html_reversed,
-        "<!-- %sheet_current% -->": "1",  # TODO: handle multi-page documents
-        "<!-- %sheet_total% -->": "1",  # TODO: handle multi-page documents
+        "<!-- %sheet_total% -->": str(len(diagrams)),
         "<!-- %template_sheetsize% -->": metadata.get("template", {}).get(
             "sheetsize", ""
         ),
     }
 
-    def replacement_if_used(key: str, func: Callable[[], str]) -> None:
+    def replacement_if_used(
+        replacements: Dict[str, str], key: str, func: Callable[[], str]
+    ) -> None:
         """Append replacement only if used in html."""
-        if key in html:
+        if key in template.placeholders:
             replacements[key] = func()
 
-    replacement_if_used("<!-- %diagram% -->", svgdata)
-    replacement_if_used(
-        "<!-- %diagram_png_b64% -->", lambda: data_URI_base64(f"{filename}.png")
-    )
+    replacement_if_used(replacements, "<!-- %bom% -->", bom_html)
+    replacement_if_used(replacements, "<!-- %bom_reversed% -->", bom_html_reversed)
 
     # prepare metadata replacements
     if metadata:
@@ -111,20 +184,27 @@ def generate_html_output(
                     if isinstance(entry, Dict):
                         replacements[f"<!-- %{item}_{index+1}% -->"] = str(category)
                         for entry_key, entry_value in entry.items():
-                            replacements[
-                                f"<!-- %{item}_{index+1}_{entry_key}% -->"
-                            ] = html_line_breaks(str(entry_value))
+                            replacements[f"<!-- %{item}_{index+1}_{entry_key}% -->"] = (
+                                html_line_breaks(str(entry_value))
+                            )
                     elif isinstance(entry, (str, int, float)):
                         pass  # TODO?: replacements[f"<!-- %{item}_{category}% -->"] = html_line_breaks(str(entry))
 
-    # perform replacements
-    # regex replacement adapted from:
-    # https://gist.github.com/bgusach/a967e0587d6e01e889fd1d776c5f3729
-
-    # longer replacements first, just in case
-    replacements_sorted = sorted(replacements, key=len, reverse=True)
-    replacements_escaped = map(re.escape, replacements_sorted)
-    pattern = re.compile("|".join(replacements_escaped))
-    html = pattern.sub(lambda match: replacements[match.group(0)], html)
-
-    file_write_text(f"{filename}.html", html)
+    # perform replacements, once per page
+    pages = []
+    for number, diagram in enumerate(diagrams, 1):
+        page_replacements = replacements.copy()
+        page_replacements["<!-- %sheet_current% -->"] = str(number)
+        if number > 1:
+            page_replacements["<!-- %bom% -->"] = ""
+            page_replacements["<!-- %bom_reversed% -->"] = ""
+        replacement_if_used(
+            page_replacements, "<!-- %diagram% -->", lambda: svgdata(diagram)
+        )
+        replacement_if_used(
+            page_replacements,
+            "<!-- %diagram_png_b64% -->",
+            lambda: data_URI_base64(f"{diagram}.png"),
+        )
+        pages.append(template.render(page_replacements))
+    file_write_text(f"{filename}.html", combine_pages(pages))
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+
+from wireviz import APP_NAME
+from wireviz.DataClasses import Metadata, Options, Tweak
+from wireviz.Harness import Harness
+from wireviz.wv_helper import open_file_read
+
+# columns of a wire list, matching the output of the "wires" format
+COLUMNS = {
+    "from": "From",
+    "from_pin": "From Pin",
+    "from_label": "From Label",
+    "cable": "Cable",
+    "wire": "Wire",
+    "color": "Color",
+    "gauge": "Gauge",
+    "length": "Length",
+    "to": "To",
+    "to_pin": "To Pin",
+    "to_label": "To Label",
+}
+SHIELD_NAMES = ("s", "shield")
+# a number (or an AWG size such as 4/0), optionally followed by a unit
+VALUE_UNIT = re.compile(r"(\d+/0|\d*\.?\d+(?:[eE][-+]?\d+)?)\s*([^\d\s].*)?")
+
+# line number, from name and pin, cable and wire, to name and pin
+Row = Tuple[int, Optional[str], Any, str, Any, Optional[str], Any]
+
+
+def import_wire_list(
+    source: Union[Path, str, TextIO],
+    library: Optional[Dict] = None,
+    delimiter: Optional[str] = None,
+    title: Optional[str] = None,
+) -> Harness:
+    """Return a harness built from a CSV or TSV from/to wire list.
+
+    Each row connects one wire of a cable (columns Cable and Wire) from a
+    connector pin (From, From Pin) to a connector pin (To, To Pin);
+    either end may be left empty. Connectors and cables are taken from the
+    connectors and cables sections of the library (a dict as read from a
+    WireViz YAML file, which may also contain metadata, options and tweak),
+    keyed by designator. Components missing from the library are inferred
+    from the rows: pins and pin labels of connectors, and wire count,
+    colors, gauge and length of cables.
+    All connections are made with Harness.connect(), and thus validated
+    the same way as connections read from YAML input.
+    """
+    if isinstance(source, (Path, str)):
+        path = Path(source)
+        if delimiter is None and path.suffix.lower() in (".csv", ".tsv"):
+            delimiter = "\t" if path.suffix.lower() == ".tsv" else ","
+        with open_file_read(path) as file:
+            return import_wire_list(file, library, delimiter, title or path.stem)
+
+    library = library or {}
+    lines = iter(source)
+    header_line = next(lines, "").lstrip("\ufeff")  # byte order mark, e.g. from Excel
+    if delimiter is None:
+        delimiter = "\t" if "\t" in header_line else ","
+    reader = csv.reader(lines, delimiter=delimiter)
+    header = next(csv.reader([header_line], delimiter=delimiter), [])
+    index = {name.strip().lower(): i for i, name in enumerate(header)}
+    columns = {}
+    for key, name in COLUMNS.items():
+        columns[key] = index.get(name.lower())
+    for key in ("cable", "wire"):
+        if columns[key] is None:
+            raise Exception(f"Wire list has no {COLUMNS[key]} column")
+
+    def cell(values: List[str], key: str) -> str:
+        i = columns[key]
+        return values[i].strip() if i is not None and i < len(values) else ""
+
+    connectors = library.get("connectors") or {}
+    cables = library.get("cables") or {}
+    inferred_connectors: Dict[str, Dict[Any, str]] = {}  # name -> pin -> label
+    inferred_cables: Dict[str, Dict[str, Any]] = {}
+    used_connectors = set()
+    rows: List[Row] = []
+    for line, values in enumerate(reader, 2):
+        if not any(value.strip() for value in values):
+            continue  # skip empty lines
+        try:
+            cable = cell(values, "cable")
+            wire = _pin_or_wire(cell(values, "wire"))
+            if not cable or wire == "":
+                raise Exception("a cable and wire must be given")
+            if isinstance(wire, str) and wire.lower() in SHIELD_NAMES:
+                wire = "s"
+            ends = []
+            for side in ("from", "to"):
+                name = cell(values, side) or None
+                pin = _pin_or_wire(cell(values, f"{side}_pin"))
+                if name is not None and name not in connectors:
+                    label = cell(values, f"{side}_label")
+                    pins = inferred_connectors.setdefault(name, {})
+                    if pin == "":
+                        pin = 1  # a connector without pins, e.g. a ferrule
+                    if label and pins.get(pin) not in (None, "", label):
+                        raise Exception(
+                            f"{name}:{pin} is labeled both {pins[pin]} and {label}"
+                        )
+                    if label or pin not in pins:
+                        pins[pin] = label
+                else:
+                    used_connectors.add(name)
+                ends.extend([name, pin if name is not None else None])
+            if cable not in cables:
+                _infer_cable(
+                    inferred_cables.setdefault(cable, {"wires": {}}),
+                    wire,
+                    cell(values, "color"),
+                    cell(values, "gauge"),
+                    cell(values, "length"),
+                )
+        except Exception as e:
+            raise Exception(f"Wire list line {line}: {e}")
+        rows.append((line, ends[0], ends[1], cable, wire, ends[2], ends[3]))
+
+    harness = Harness(
+        metadata=Metadata(**library.get("metadata", {})),
+        options=Options(**library.get("options", {})),
+        tweak=Tweak(**library.get("tweak", {})),
+    )
+    if "title" not in harness.metadata:
+        harness.metadata["title"] = title or f"{APP_NAME} diagram and BOM"
+
+    # library components are only added when used, like templates in YAML input
+    for name, attribs in connectors.items():
+        if name in used_connectors:
+            harness.add_connector(name=name, **attribs)
+    for name, pins in inferred_connectors.items():
+        harness.add_connector(name=name, **_connector_attribs(pins))
+    used_cables = {row[3] for row in rows}
+    for name, attribs in cables.items():
+        if name in used_cables:
+            harness.add_cable(name=name, **attribs)
+    for name, inferred in inferred_cables.items():
+        harness.add_cable(name=name, **_cable_attribs(inferred))
+
+    for line, *connection in rows:
+        try:
+            harness.connect(*connection)
+        except Exception as e:
+            raise Exception(f"Wire list line {line}: {e}")
+    return harness
+
+
+def _pin_or_wire(value: str) -> Union[int, str]:
+    return int(value) if value.isdigit() else value
+
+
+def _infer_cable(
+    inferred: Dict[str, Any], wire: Union[int, str], color: str, gauge: str, length: str
+) -> None:
+    if wire == "s":
+        inferred["shield"] = True
+    else:
+        colors = inferred["wires"]
+        if color and colors.get(wire) not in (None, "", color):
+            raise Exception(f"wire {wire} is colored both {colors[wire]} and {color}")
+        if color or wire not in colors:
+            colors[wire] = color
+    for key, text in (("gauge", gauge), ("length", length)):
+        if not text:
+            continue
+        value = _parse_value_unit(key, text)
+        known = inferred.get(key)
+        if known is not None:
+            # a value without unit matches the same value with any unit
+            units = {known[1], value[1]} - {None}
+            if known[0] != value[0] or len(units) > 1:
+                raise Exception(f"{key} is both {_format_value_unit(known)} and {text}")
+            value = (value[0], value[1] or known[1])
+        inferred[key] = value
+
+
+def _parse_value_unit(key: str, text: str) -> Tuple[Union[float, str], Optional[str]]:
+    """Return the number and unit (None if not given) of a gauge or length cell."""
+    match = VALUE_UNIT.fullmatch(text.strip())
+    if match is None or (key == "length" and "/" in match[1]):
+        raise Exception(f"{key} {text} must be a number, optionally followed by a unit")
+    number, unit = match[1], match[2]
+    value = number if "/" in number else float(number)
+    if unit is not None:
+        unit = unit.strip()
+        if unit.upper() == "AWG":
+            unit = "AWG"
+        elif unit.lower() in ("mm2", "mm²"):
+            unit = "mm\u00b2"
+    elif isinstance(value, str):
+        unit = "AWG"  # only AWG sizes are written as 4/0
+    return value, unit
+
+
+def _format_value_unit(value: Tuple[Union[float, str], Optional[str]]) -> str:
+    number = value[0] if isinstance(value[0], str) else f"{value[0]:g}"
+    return f"{number} {value[1]}" if value[1] else number
+
+
+def _connector_attribs(pins: Dict[Any, str]) -> Dict[str, Any]:
+    """Return connector attributes with the pins and labels seen in the wire list."""
+    if all(isinstance(pin, int) and pin > 0 for pin in pins):
+        pinlist = list(range(1, max(pins) + 1))
+    else:
+        pinlist = list(pins)
+    attribs = {"pins": pinlist}
+    if any(pins.values()):
+        attribs["pinlabels"] = [pins.get(pin, "") for pin in pinlist]
+    return attribs
+
+
+def _cable_attribs(inferred: Dict[str, Any]) -> Dict[str, Any]:
+    """Return cable attributes with the wires seen in the wire list.
+
+    Numbered wires keep their number; other wire names become wire labels
+    of additional wires following the numbered ones.
+    """
+    wires = inferred["wires"]
+    numbered = [wire for wire in wires if isinstance(wire, int)]
+    labeled = [wire for wire in wires if not isinstance(wire, int)]
+    wirecount = max(numbered, default=0)
+    attribs = {"wirecount": wirecount + len(labeled) or 1}
+    order = list(range(1, wirecount + 1)) + labeled
+    if any(wires.values()):
+        attribs["colors"] = [wires.get(wire, "") for wire in order]
+    if labeled:
+        attribs["wirelabels"] = [""] * wirecount + labeled
+    if inferred.get("shield"):
+        attribs["shield"] = True
+    for key in ("gauge", "length"):
+        value = inferred.get(key)
+        if value:
+            attribs[key] = _format_value_unit(value) if value[1] else value[0]
+    return attribs
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Sequence, TypeVar
+
+if TYPE_CHECKING:
+    from graphviz import Graph
+
+T = TypeVar("T")
+
+
+def parallel_jobs() -> int:
+    """Return the number of Graphviz processes to run at the same time."""
+    return os.cpu_count() or 1
+
+
+def balance(groups: Sequence[Sequence[T]], count: int) -> List[List[T]]:
+    """Distribute groups over at most count batches of similar total size.
+
+    Small groups are combined, so that there are no more layout runs than
+    can be run at the same time. The order of items within batches is kept.
+    """
+    batches = [[] for _ in range(min(count, len(groups)))]
+    sizes = [0] * len(batches)
+    # assign largest groups first, each to the currently smallest batch
+    order = sorted(range(len(groups)), key=lambda i: len(groups[i]), reverse=True)
+    assigned = {}
+    for i in order:
+        batch = sizes.index(min(sizes))
+        sizes[batch] += len(groups[i])
+        assigned[i] = batch
+    for i, group in enumerate(groups):
+        batches[assigned[i]].extend(group)
+    return batches
+
+
+def run_parallel(function, items: Sequence) -> List:
+    """Return the results of function for each item, computed in parallel threads.
+
+    Threads suffice since the work is done by Graphviz subprocesses.
+    """
+    if len(items) < 2:
+        return [function(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(parallel_jobs(), len(items))) as pool:
+        return list(pool.map(function, items))
+
+
+def packing_available() -> bool:
+    return shutil.which("gvpack") is not None and shutil.which("neato") is not None
+
+
+def render_packed(graphs: Sequence["Graph"], outputs: Dict[str, str]) -> None:
+    """Lay out each graph in a separate dot process, and pack the results.
+
+    outputs maps output formats (e.g. svg) to the output file names.
+    The laid out graphs are combined with gvpack and rendered by neato,
+    keeping the positions computed by dot.
+    """
+    laid_out = run_parallel(lambda graph: graph.pipe(format="dot"), graphs)
+    packed = _run(["gvpack"], b"".join(laid_out))
+    run_parallel(
+        lambda output: _run(
+            ["neato", "-s", "-n2", f"-T{output[0]}", f"-o{output[1]}"], packed
+        ),
+        list(outputs.items()),
+    )
+
+
+def _run(command: List[str], data: bytes) -> bytes:
+    result = subprocess.run(command, input=data, capture_output=True)
+    if result.returncode != 0:
+        raise Exception(
+            f"{command[0]} failed with exit code {result.returncode}:\n"
+            + result.stderr.decode("utf-8", errors="replace")
+        )
+    return result.stdout
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import yaml
+
+from wireviz.wv_yaml import StreamingLoader, load_yaml
+
+LIBRARY_SECTIONS = ("connectors", "cables")
+LIBRARY_SUFFIXES = (".yml", ".yaml")
+INDEX_VERSION = 1
+
+# name -> [byte offset, byte length] of its entry, or None if the file must be
+# loaded as a whole (e.g. because entries share YAML anchors)
+SectionIndex = Dict[str, Optional[List[int]]]
+FileIndex = Dict[str, SectionIndex]
+
+# index of each library file read by this process, keyed by path, mtime and size
+_index_cache: Dict[Tuple[str, int, int], FileIndex] = {}
+
+
+class ComponentLibrary:
+    """Connector and cable templates stored in external YAML files.
+
+    The library files use the connectors and cables sections of the WireViz
+    YAML syntax; directories are searched for .yml and .yaml files.
+    Each file is indexed once, recording where each template is defined,
+    and a template is only read and parsed when it is looked up.
+    Indexes are kept for the lifetime of the process and, if a cache
+    directory is given, also stored there until the file changes.
+    Files listed first take precedence when a template is defined twice.
+    """
+
+    def __init__(
+        self,
+        paths: List[Union[str, Path]],
+        cache_dir: Union[str, Path, None] = None,
+    ):
+        self.files: List[Path] = []
+        for path in map(Path, paths):
+            if path.is_dir():
+                self.files.extend(
+                    sorted(
+                        file
+                        for file in path.rglob("*")
+                        if file.suffix.lower() in LIBRARY_SUFFIXES
+                    )
+                )
+            elif path.exists():
+                self.files.append(path)
+            else:
+                raise Exception(f"Component library does not exist:\n{path}")
+        self.sections = {
+            section: LibrarySection(self, section) for section in LIBRARY_SECTIONS
+        }
+        # template name -> file index into self.files, per section
+        self._locations: Dict[str, Dict[str, int]] = {s: {} for s in LIBRARY_SECTIONS}
+        self._indexes: List[FileIndex] = []
+        for number, file in enumerate(self.files):
+            index = index_library_file(file, cache_dir)
+            self._indexes.append(index)
+            for section in LIBRARY_SECTIONS:
+                for name in index.get(section, {}):
+                    self._locations[section].setdefault(name, number)
+        self._whole_files: Dict[int, Dict] = {}
+
+    def load(self, section: str, name: str) -> Dict[str, Any]:
+        """Return the attributes of a template, reading only its own entry if possible."""
+        number = self._locations[section][name]
+        file = self.files[number]
+        location = self._indexes[number][section][name]
+        if location is None:
+            if number not in self._whole_files:
+                self._whole_files[number] = load_yaml(file.read_text(encoding="utf-8"))
+            attribs = self._whole_files[number][section][name]
+        else:
+            offset, length = location
+            with file.open("rb") as f:
+                f.seek(offset)
+                entry = load_yaml(f.read(length).decode("utf-8"))
+            attribs = next(iter(entry.values()))
+        if not isinstance(attribs, dict):
+            raise Exception(f"Template {name} in {file} is not a mapping")
+        # relative image files are found next to the library file
+        image = attribs.get("image")
+        if isinstance(image, dict) and image.get("src"):
+            if not Path(image["src"]).is_absolute():
+                image["src"] = (file.parent / image["src"]).resolve()
+        return attribs
+
+
+class LibrarySection(Mapping):
+    """The templates of one section of a library, loaded when first accessed."""
+
+    def __init__(self, library: ComponentLibrary, section: str):
+        self.library = library
+        self.section = section
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.library._locations[self.section]
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        if name not in self._loaded:
+            if name not in self:
+                raise KeyError(name)
+            self._loaded[name] = self.library.load(self.section, name)
+        return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.library._locations[self.section])
+
+    def __len__(self) -> int:
+        return len(self.library._locations[self.section])
+
+
+def index_library_file(
+    file: Path, cache_dir: Union[str, Path, None] = None
+) -> FileIndex:
+    """Return the index of the templates of a library file, built once per file version."""
+    stat = file.stat()
+    key = (str(file.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key in _index_cache:
+        return _index_cache[key]
+
+    cache_file = None
+    if cache_dir:
+        digest = hashlib.sha256(key[0].encode("utf-8")).hexdigest()
+        cache_file = Path(cache_dir) / f"library-{digest}.json"
+        try:
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+            if cached.get("version") == INDEX_VERSION and cached.get("file") == list(
+                key
+            ):
+                _index_cache[key] = cached["index"]
+                return cached["index"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable library index {cache_file}: {e}")
+
+    try:
+        index = _build_index(file.read_bytes())
+    except Exception as e:
+        raise Exception(f"Component library {file}: {e}")
+    _index_cache[key] = index
+    if cache_file is not None:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first, to never leave a partial index behind
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_text(
+            json.dumps({"version": INDEX_VERSION, "file": list(key), "index": index}),
+            encoding="utf-8",
+        )
+        tmp_file.replace(cache_file)
+    return index
+
+
+def _build_index(data: bytes) -> FileIndex:
+    """Return the byte ranges of the templates in the YAML data.
+
+    The YAML events are scanned without constructing any values. Each entry
+    of a block-style section spans from the line of its name up to the line
+    of the next name, and parses on its own. Files using aliases, or flow
+    style sections, are indexed by name only and later loaded as a whole.
+    """
+    lines = data.splitlines(keepends=True)
+    line_offsets = [0, *accumulate(len(line) for line in lines)]
+    entries: Dict[str, List[Tuple[Optional[str], int]]] = {}  # name and line
+    sliceable = True
+
+    loader = StreamingLoader(data)
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(yaml.StreamEndEvent):
+            return {}
+        loader.get_event()  # DocumentStartEvent
+        if not loader.check_event(yaml.MappingStartEvent):
+            raise Exception("A component library file must contain a YAML mapping")
+        loader.get_event()
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = loader.get_event()
+            section = key.value if isinstance(key, yaml.ScalarEvent) else None
+            if section not in LIBRARY_SECTIONS:
+                _skip_node(loader)
+                continue
+            start = loader.get_event()
+            if not isinstance(start, yaml.MappingStartEvent):
+                _skip_node(loader, start)
+                continue
+            sliceable &= not start.flow_style
+            names = entries.setdefault(section, [])
+            while not loader.check_event(yaml.MappingEndEvent):
+                name = loader.get_event()
+                if isinstance(name, yaml.ScalarEvent):
+                    names.append((name.value, name.start_mark.line))
+                else:
+                    sliceable &= _skip_node(loader, name)
+                sliceable &= _skip_node(loader)
+            end_line = loader.get_event().start_mark.line
+            names.append((None, end_line))  # end of the last entry
+    finally:
+        loader.dispose()
+
+    index: FileIndex = {}
+    for section, names in entries.items():
+        items = index.setdefault(section, {})
+        for (name, line), (_, next_line) in zip(names, names[1:]):
+            if name is None:
+                continue
+            if not sliceable or next_line <= line:
+                items[name] = None
+            else:
+                offset = line_offsets[line]
+                items[name] = [offset, line_offsets[next_line] - offset]
+    return index
+
+
+def _skip_node(loader: StreamingLoader, event: Optional[yaml.Event] = None) -> bool:
+    """Consume the events of the next node, or of the node started by event.
+
+    Return False if it contains an alias, which could refer to another entry.
+    """
+    depth = 0
+    sliceable = True
+    while True:
+        if event is None:
+            event = loader.get_event()
+        if isinstance(event, yaml.AliasEvent):
+            sliceable = False
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+        event = None
+        if depth == 0:
+            return sliceable
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, TextIO, Tuple
+
+from wireviz.DataClasses import Designator, MateComponent, MatePin, Pin
+
+if TYPE_CHECKING:
+    from wireviz.Harness import Harness
+
+Terminal = Tuple[
+    Designator, Pin
+]  # a connector pin, or a cable wire (or "s" for shield)
+
+
+class UnionFind:
+    """Disjoint sets of hashable items, with path halving and union by size."""
+
+    def __init__(self):
+        self.parent: Dict[Hashable, Hashable] = {}
+        self.size: Dict[Hashable, int] = {}
+
+    def add(self, item: Hashable) -> None:
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item: Hashable) -> Hashable:
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: Hashable, b: Hashable) -> None:
+        self.add(a)
+        self.add(b)
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+@dataclass
+class Net:
+    name: str
+    pins: List[Terminal] = field(default_factory=list)  # connector pins
+    wires: List[Terminal] = field(default_factory=list)  # cable wires and shields
+    labels: List[str] = field(default_factory=list)  # distinct pin labels
+
+
+class Netlist:
+    """Electrical nets of a harness, joined by wires, pin mates and loops.
+
+    Connectors mated as a whole join their pins of the same name.
+    Nets are numbered N1, N2, ... in order of their first connector pin.
+    """
+
+    def __init__(self, harness: "Harness", include_unconnected: bool = False):
+        sets = UnionFind()
+        terminals: List[Terminal] = []
+        pinlabels: Dict[Terminal, str] = {}
+        for connector in harness.connectors.values():
+            for index, pin in enumerate(connector.pins):
+                terminal = (connector.name, pin)
+                terminals.append(terminal)
+                sets.add(terminal)
+                if index < len(connector.pinlabels) and connector.pinlabels[index]:
+                    pinlabels[terminal] = str(connector.pinlabels[index])
+            for loop in connector.loops:
+                sets.union((connector.name, loop[0]), (connector.name, loop[1]))
+        for cable in harness.cables.values():
+            for connection in cable.connections:
+                wire = (cable.name, connection.via_port)
+                if wire not in sets.parent:
+                    terminals.append(wire)
+                    sets.add(wire)
+                if connection.from_name is not None:
+                    sets.union((connection.from_name, connection.from_pin), wire)
+                if connection.to_name is not None:
+                    sets.union(wire, (connection.to_name, connection.to_pin))
+        for mate in harness.mates:
+            if isinstance(mate, MatePin):
+                sets.union((mate.from_name, mate.from_pin), (mate.to_name, mate.to_pin))
+            elif isinstance(mate, MateComponent):
+                to_pins = set(harness.connectors[mate.to_name].pins)
+                for pin in harness.connectors[mate.from_name].pins:
+                    if pin in to_pins:
+                        sets.union((mate.from_name, pin), (mate.to_name, pin))
+
+        nets: Dict[Hashable, Net] = {}
+        for terminal in terminals:
+            net = nets.setdefault(sets.find(terminal), Net(""))
+            if terminal[0] in harness.connectors:
+                net.pins.append(terminal)
+                label = pinlabels.get(terminal)
+                if label and label not in net.labels:
+                    net.labels.append(label)
+            else:
+                net.wires.append(terminal)
+
+        self.nets: List[Net] = []
+        self._net_of: Dict[Terminal, Net] = {}
+        for root, net in nets.items():
+            if not include_unconnected and len(net.pins) + len(net.wires) < 2:
+                continue
+            net.name = f"N{len(self.nets) + 1}"
+            self.nets.append(net)
+            for terminal in net.pins + net.wires:
+                self._net_of[terminal] = net
+
+    def net(self, designator: Designator, pin: Pin) -> Optional[Net]:
+        """Return the net of a connector pin or cable wire, or None if unconnected."""
+        return self._net_of.get((designator, pin))
+
+    def connected(self, a: Terminal, b: Terminal) -> bool:
+        """Return True if both terminals are part of the same net."""
+        net = self._net_of.get(a)
+        return net is not None and net is self._net_of.get(b)
+
+
+def terminal_str(terminal: Terminal) -> str:
+    return f"{terminal[0]}:{terminal[1]}"
+
+
+def write_nets_json(file: TextIO, netlist: Netlist) -> None:
+    """Write the nets to file as one JSON array of objects."""
+    nets = [
+        {
+            "net": net.name,
+            "labels": net.labels,
+            "pins": [terminal_str(pin) for pin in net.pins],
+            "wires": [terminal_str(wire) for wire in net.wires],
+        }
+        for net in netlist.nets
+    ]
+    json.dump(nets, file, ensure_ascii=False, indent=1)
+    file.write("\n")
+
+
+def write_nets_csv(file: TextIO, netlist: Netlist) -> None:
+    """Write the nets to file as comma-separated text, one row per pin or wire.
+
+    The file should be opened with newline="" as required by the csv module.
+    """
+    writer = csv.writer(file)
+    writer.writerow(["Net", "Type", "Designator", "Pin/Wire", "Labels"])
+    for net in netlist.nets:
+        labels = ", ".join(net.labels)
+        for designator, pin in net.pins:
+            writer.writerow([net.name, "pin", designator, pin, labels])
+        for designator, wire in net.wires:
+            writer.writerow([net.name, "wire", designator, wire, labels])
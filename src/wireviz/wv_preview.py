@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass, field
+from html import escape
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from wireviz.DataClasses import MatePin
+from wireviz.wv_colors import get_color_hex, translate_color
+from wireviz.wv_helper import remove_links
+
+if TYPE_CHECKING:
+    from wireviz.Harness import Harness
+
+FONT_SIZE = 11
+CHAR_WIDTH = 7  # approximate width of one character at FONT_SIZE
+ROW_HEIGHT = 16
+COLUMN_GAP = 100
+NODE_GAP = 24
+MARGIN = 20
+SWEEPS = 4  # number of barycentric ordering passes in each direction
+
+
+@dataclass
+class PreviewNode:
+    """A connector or cable box of the preview, with one row per pin or wire."""
+
+    name: str
+    title: str
+    rows: List[str]
+    ports: Dict[Any, Optional[int]]  # pin or wire -> row index (None: whole box)
+    row_colors: List[List[str]] = field(default_factory=list)  # wires only
+    column: int = 0
+    x: float = 0
+    y: float = 0
+    width: float = 0
+
+    @property
+    def height(self) -> float:
+        return (len(self.rows) + 1) * ROW_HEIGHT + 4
+
+    def port_y(self, row: Optional[int]) -> float:
+        if row is None:
+            return self.y + self.height / 2
+        offset = 4 if self.row_colors else 0  # wires are drawn below their text
+        return self.y + (row + 1.5) * ROW_HEIGHT + offset
+
+
+@dataclass
+class PreviewEdge:
+    from_node: PreviewNode
+    from_row: Optional[int]
+    to_node: PreviewNode
+    to_row: Optional[int]
+    colors: List[str]
+    dashed: bool = False
+
+
+def generate_preview_svg(harness: "Harness", orthogonal: bool = True) -> str:
+    """Return a quick SVG drawing of the harness, laid out without Graphviz.
+
+    Connectors and cables are placed in columns following the connection
+    chains from left to right, and ordered within each column to reduce
+    wire crossings. Wires are drawn as orthogonal or straight lines.
+    """
+    nodes = _preview_nodes(harness)
+    edges = _preview_edges(harness, nodes)
+    columns = _assign_columns(nodes, edges)
+    _order_columns(columns, edges)
+    return _render_svg(harness, nodes, columns, edges, orthogonal)
+
+
+def _preview_nodes(harness: "Harness") -> Dict[str, PreviewNode]:
+    nodes = {}
+    mode = harness.options.color_mode
+    for connector in harness.connectors.values():
+        title = remove_links(connector.name) if connector.show_name else ""
+        if connector.style == "simple":
+            nodes[connector.name] = PreviewNode(
+                connector.name, title or str(connector.type or ""), [], {}
+            )
+            continue
+        rows, ports = [], {}
+        labels = connector.pinlabels + [""] * len(connector.pins)
+        for pin, label in zip(connector.pins, labels):
+            if connector.hide_disconnected_pins and not connector.visible_pins.get(
+                pin, False
+            ):
+                continue
+            ports[pin] = len(rows)
+            rows.append(f"{pin} {label}" if label else str(pin))
+        nodes[connector.name] = PreviewNode(connector.name, title, rows, ports)
+
+    for cable in harness.cables.values():
+        title = remove_links(cable.name) if cable.show_name else ""
+        rows, ports, row_colors = [], {}, []
+        labels = cable.wirelabels + [""] * len(cable.colors)
+        for i, (color, label) in enumerate(zip(cable.colors, labels), 1):
+            ports[i] = len(rows)
+            info = [str(i), translate_color(color, mode), label or ""]
+            rows.append(":".join(text for text in info if text))
+            row_colors.append(get_color_hex(color)[:2])
+        if cable.shield:
+            ports["s"] = len(rows)
+            rows.append("Shield")
+            shield = cable.shield if isinstance(cable.shield, str) else "BK"
+            row_colors.append(get_color_hex(shield)[:1])
+        nodes[cable.name] = PreviewNode(cable.name, title, rows, ports, row_colors)
+
+    for node in nodes.values():
+        text_length = max(len(text) for text in [node.title, *node.rows])
+        node.width = max(60, text_length * CHAR_WIDTH + 16)
+    return nodes
+
+
+def _preview_edges(
+    harness: "Harness", nodes: Dict[str, PreviewNode]
+) -> List[PreviewEdge]:
+    edges = []
+    for cable in harness.cables.values():
+        cable_node = nodes[cable.name]
+        for connection in cable.connections:
+            row = cable_node.ports.get(connection.via_port)
+            colors = cable_node.row_colors[row] if row is not None else ["#000000"]
+            if connection.from_name is not None:
+                from_node = nodes[connection.from_name]
+                from_row = from_node.ports.get(connection.from_pin)
+                edges.append(PreviewEdge(from_node, from_row, cable_node, row, colors))
+            if connection.to_name is not None:
+                to_node = nodes[connection.to_name]
+                to_row = to_node.ports.get(connection.to_pin)
+                edges.append(PreviewEdge(cable_node, row, to_node, to_row, colors))
+    for mate in harness.mates:
+        from_node, to_node = nodes[mate.from_name], nodes[mate.to_name]
+        if isinstance(mate, MatePin):
+            from_row = from_node.ports.get(mate.from_pin)
+            to_row = to_node.ports.get(mate.to_pin)
+        else:  # MateComponent
+            from_row = to_row = None
+        edges.append(
+            PreviewEdge(from_node, from_row, to_node, to_row, ["#000000"], True)
+        )
+    return edges
+
+
+def _assign_columns(
+    nodes: Dict[str, PreviewNode], edges: List[PreviewEdge]
+) -> List[List[PreviewNode]]:
+    """Place each node one column right of the nodes it is connected from."""
+    successors = {name: {} for name in nodes}  # dicts keep the order
+    indegree = dict.fromkeys(nodes, 0)
+    for edge in edges:
+        a, b = edge.from_node.name, edge.to_node.name
+        if a != b and b not in successors[a]:
+            successors[a][b] = None
+            indegree[b] += 1
+
+    remaining = dict.fromkeys(nodes)
+    ready = [name for name in nodes if indegree[name] == 0]
+    while remaining:
+        if not ready:  # only cycles are left; break them in harness order
+            ready = [next(iter(remaining))]
+        for name in ready:
+            remaining.pop(name, None)
+        next_ready = []
+        for name in ready:
+            for successor in successors[name]:
+                if successor not in remaining:
+                    continue  # already placed, i.e. part of a broken cycle
+                nodes[successor].column = max(
+                    nodes[successor].column, nodes[name].column + 1
+                )
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    next_ready.append(successor)
+        ready = next_ready
+
+    columns = [[] for _ in range(max(node.column for node in nodes.values()) + 1)]
+    for node in nodes.values():
+        columns[node.column].append(node)
+    return columns
+
+
+def _stack(column: List[PreviewNode]) -> None:
+    y = MARGIN
+    for node in column:
+        node.y = y
+        y += node.height + NODE_GAP
+
+
+def _order_columns(columns: List[List[PreviewNode]], edges: List[PreviewEdge]):
+    """Reduce crossings by sorting nodes by the mean height of their wires' other ends."""
+    links = {}  # node name -> list of (own row, other node, other row)
+    for edge in edges:
+        links.setdefault(edge.from_node.name, []).append(
+            (edge.from_row, edge.to_node, edge.to_row)
+        )
+        links.setdefault(edge.to_node.name, []).append(
+            (edge.to_row, edge.from_node, edge.from_row)
+        )
+    for column in columns:
+        _stack(column)
+
+    def sweep(order: List[List[PreviewNode]], from_left: bool) -> None:
+        for column in order:
+            current = {id(node): node.y for node in column}
+
+            def barycenter(node: PreviewNode) -> float:
+                ys = [
+                    other.port_y(other_row) - (node.port_y(row) - node.y)
+                    for row, other, other_row in links.get(node.name, [])
+                    if (other.column < node.column) == from_left
+                    and other.column != node.column
+                ]
+                return sum(ys) / len(ys) if ys else current[id(node)]
+
+            column.sort(key=barycenter)
+            _stack(column)
+
+    for _ in range(SWEEPS):
+        sweep(columns[1:], from_left=True)
+        sweep(columns[-2::-1], from_left=False)
+
+
+def _render_svg(
+    harness: "Harness",
+    nodes: Dict[str, PreviewNode],
+    columns: List[List[PreviewNode]],
+    edges: List[PreviewEdge],
+    orthogonal: bool,
+) -> str:
+    x = MARGIN
+    for column in columns:
+        width = max((node.width for node in column), default=0)
+        for node in column:
+            node.x = x + (width - node.width) / 2
+        x += width + COLUMN_GAP
+    width = x - COLUMN_GAP + MARGIN
+    height = max((node.y + node.height for node in nodes.values()), default=0)
+    height += MARGIN
+    bgcolor = translate_color(harness.options.bgcolor, "HEX")
+    fillcolor = translate_color(harness.options.bgcolor_node, "HEX")
+
+    svg = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:.0f}" height="{height:.0f}" '
+        f'viewBox="0 0 {width:.0f} {height:.0f}" font-family="{escape(harness.options.fontname)}" '
+        f'font-size="{FONT_SIZE}">',
+        f'<rect width="100%" height="100%" fill="{bgcolor}"/>',
+    ]
+
+    for edge in edges:
+        x1, y1 = edge.from_node.x + edge.from_node.width, edge.from_node.port_y(
+            edge.from_row
+        )
+        x2, y2 = edge.to_node.x, edge.to_node.port_y(edge.to_row)
+        if orthogonal and x2 > x1:
+            xm = (x1 + x2) / 2
+            path = f"M{x1:.1f},{y1:.1f} H{xm:.1f} V{y2:.1f} H{x2:.1f}"
+        else:
+            path = f"M{x1:.1f},{y1:.1f} L{x2:.1f},{y2:.1f}"
+        svg.extend(_wire(path, edge.colors, edge.dashed))
+
+    for node in nodes.values():
+        svg.append(
+            f'<rect x="{node.x:.1f}" y="{node.y:.1f}" width="{node.width:.1f}" '
+            f'height="{node.height:.1f}" fill="{fillcolor}" stroke="#000000"/>'
+        )
+        svg.append(
+            f'<text x="{node.x + node.width / 2:.1f}" y="{node.y + ROW_HEIGHT - 3:.1f}" '
+            f'text-anchor="middle" font-weight="bold">{escape(node.title)}</text>'
+        )
+        for row, text in enumerate(node.rows):
+            y = node.port_y(row)
+            if node.row_colors:  # wire: text above a colored line
+                svg.append(
+                    f'<text x="{node.x + node.width / 2:.1f}" y="{y - 6:.1f}" '
+                    f'text-anchor="middle">{escape(text)}</text>'
+                )
+                path = f"M{node.x:.1f},{y:.1f} H{node.x + node.width:.1f}"
+                svg.extend(_wire(path, node.row_colors[row], False))
+            else:  # pin
+                svg.append(
+                    f'<text x="{node.x + 6:.1f}" y="{y + 4:.1f}">{escape(text)}</text>'
+                )
+    svg.append("</svg>")
+    return "\n".join(svg) + "\n"
+
+
+def _wire(path: str, colors: List[str], dashed: bool) -> List[str]:
+    """Return SVG paths drawing a wire with a black outline and up to two colors."""
+    if dashed:
+        return [
+            f'<path d="{path}" fill="none" stroke="#000000" stroke-dasharray="6,4"/>'
+        ]
+    lines = [
+        f'<path d="{path}" fill="none" stroke="#000000" stroke-width="4"/>',
+        f'<path d="{path}" fill="none" stroke="{colors[0]}" stroke-width="2"/>',
+    ]
+    if len(colors) > 1 and colors[1] != colors[0]:
+        lines.append(
+            f'<path d="{path}" fill="none" stroke="{colors[1]}" stroke-width="2" '
+            'stroke-dasharray="6,6"/>'
+        )
+    return lines
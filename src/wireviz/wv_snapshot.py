@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+import gzip
+import json
+from collections.abc import Sequence
+from dataclasses import MISSING, astuple, fields, is_dataclass
+from datetime import date, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Union
+
+from wireviz import __version__
+from wireviz.DataClasses import (
+    AdditionalComponent,
+    Cable,
+    Connection,
+    Connector,
+    Image,
+    MateComponent,
+    MatePin,
+    Metadata,
+    Options,
+    Tweak,
+)
+from wireviz.Harness import Harness
+
+SNAPSHOT_FORMAT = "wireviz-harness"
+SNAPSHOT_VERSION = 1
+
+# classes that may appear in a snapshot, restored without running __post_init__
+SNAPSHOT_CLASSES = {
+    cls.__name__: cls
+    for cls in (
+        AdditionalComponent,
+        Cable,
+        Connection,
+        Connector,
+        Image,
+        MateComponent,
+        MatePin,
+        Options,
+        Tweak,
+    )
+}
+
+
+def harness_to_snapshot(harness: Harness) -> Dict[str, Any]:
+    """Return the built harness as JSON-compatible data, including its BOM."""
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "generator": f"WireViz {__version__}",
+        "metadata": _encode(dict(harness.metadata)),
+        "options": _encode(harness.options),
+        "tweak": _encode(harness.tweak),
+        "connectors": [_encode(c) for c in harness.connectors.values()],
+        "cables": [_encode(c) for c in harness.cables.values()],
+        "mates": [_encode(mate) for mate in harness.mates],
+        "additional_bom_items": _encode(harness.additional_bom_items),
+        "bom": _encode(harness.bom()),
+    }
+
+
+def harness_from_snapshot(data: Dict[str, Any]) -> Harness:
+    """Return the harness stored in snapshot data.
+
+    Components are restored as they were after parsing, without expanding
+    templates or running the dataclass validation again.
+    """
+    if data.get("format") != SNAPSHOT_FORMAT:
+        raise Exception("Not a WireViz harness snapshot")
+    if data.get("version") != SNAPSHOT_VERSION:
+        raise Exception(
+            f"Unsupported harness snapshot version {data.get('version')}, "
+            f"expected version {SNAPSHOT_VERSION}"
+        )
+    harness = Harness(
+        metadata=Metadata(_decode(data["metadata"])),
+        options=_decode(data["options"]),
+        tweak=_decode(data["tweak"]),
+    )
+    for connector in map(_decode, data["connectors"]):
+        harness.connectors[connector.name] = connector
+    for cable in map(_decode, data["cables"]):
+        harness.cables[cable.name] = cable
+    harness.mates = [_decode(mate) for mate in data["mates"]]
+    harness.additional_bom_items = _decode(data["additional_bom_items"])
+    harness._bom = _decode(data["bom"])
+    return harness
+
+
+def write_snapshot(filename: Union[str, Path], harness: Harness) -> None:
+    """Write a harness snapshot file, gzip compressed if the name ends with .gz."""
+    text = json.dumps(
+        harness_to_snapshot(harness), ensure_ascii=False, separators=(",", ":")
+    )
+    opener = gzip.open if str(filename).endswith(".gz") else open
+    with opener(filename, "wt", encoding="utf-8") as file:
+        file.write(text)
+
+
+def read_snapshot(filename: Union[str, Path]) -> Harness:
+    """Return the harness of a snapshot file written by write_snapshot()."""
+    opener = gzip.open if str(filename).endswith(".gz") else open
+    with opener(filename, "rt", encoding="utf-8") as file:
+        return harness_from_snapshot(json.load(file))
+
+
+@lru_cache(maxsize=None)
+def _defaults(cls: type) -> Dict[str, Callable[[], Any]]:
+    """Return functions creating the default value of each dataclass field that has one.
+
+    Attributes equal to their default are left out of snapshots.
+    """
+    defaults = {}
+    for f in fields(cls):
+        if f.default_factory is not MISSING:
+            defaults[f.name] = f.default_factory
+        elif f.default is not MISSING:
+            defaults[f.name] = lambda default=f.default: default
+    return defaults
+
+
+def _encode(value: Any) -> Any:
+    """Return value as JSON-compatible data, tagging what JSON can not express."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Connection):  # by far the most frequent, keep it short
+        return {"__connection__": [_encode(v) for v in astuple(value)]}
+    if is_dataclass(value):
+        defaults = _defaults(type(value))
+        return {
+            "__class__": type(value).__name__,
+            **{
+                key: _encode(v)
+                for key, v in vars(value).items()
+                if key not in defaults or v != defaults[key]()
+            },
+        }
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _encode(v) for key, v in value.items()}
+        # e.g. visible_pins, keyed by pin numbers
+        return {"__items__": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(v) for v in value]}
+    if isinstance(value, datetime):  # e.g. in metadata read from YAML
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Path):  # e.g. resolved image files
+        return {"__path__": str(value)}
+    if isinstance(value, Sequence):
+        return [_encode(v) for v in value]
+    raise Exception(f"Can not store {type(value).__name__} in a harness snapshot")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if "__items__" in value:
+        return {_decode(k): _decode(v) for k, v in value["__items__"]}
+    if "__connection__" in value:
+        return Connection(*(_decode(v) for v in value["__connection__"]))
+    if "__tuple__" in value:
+        return tuple(_decode(v) for v in value["__tuple__"])
+    if "__datetime__" in value:
+        return datetime.fromisoformat(value["__datetime__"])
+    if "__date__" in value:
+        return date.fromisoformat(value["__date__"])
+    if "__path__" in value:
+        return Path(value["__path__"])
+    if "__class__" in value:
+        cls = SNAPSHOT_CLASSES.get(value["__class__"])
+        if cls is None:
+            raise Exception(f"Unknown class {value['__class__']} in harness snapshot")
+        obj = cls.__new__(cls)  # skip __init__ and __post_init__
+        obj.__dict__.update({key: default() for key, default in _defaults(cls).items()})
+        obj.__dict__.update(
+            {k: _decode(v) for k, v in value.items() if k != "__class__"}
+        )
+        return obj
+    return {key: _decode(v) for key, v in value.items()}
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+from typing import TYPE_CHECKING, Iterator, List, Optional
+
+from wireviz.DataClasses import Connector, MateComponent, MatePin, Pin
+from wireviz.wv_colors import translate_color
+from wireviz.wv_helper import remove_links
+
+if TYPE_CHECKING:
+    from wireviz.Harness import Harness
+
+
+def harness_text(harness: "Harness") -> Iterator[str]:
+    """Yield the lines of a plain text description of the harness connectivity."""
+    mode = harness.options.color_mode
+    for cable in harness.cables.values():
+        yield f"{_title('Cable', cable.name, cable.type)} ({_count(cable.wirecount, 'wire')})"
+        connections = {}
+        for connection in cable.connections:
+            connections.setdefault(connection.via_port, []).append(connection)
+        ports = list(range(1, len(cable.colors) + 1))
+        if cable.shield:
+            ports.append("s")
+        rows = []
+        for port in ports:
+            if port == "s":
+                wire, color = "S", "Shield"
+            else:
+                wire = str(port)
+                color = translate_color(cable.colors[port - 1], mode)
+                if port <= len(cable.wirelabels) and cable.wirelabels[port - 1]:
+                    color = f"{color} {cable.wirelabels[port - 1]}".strip()
+            for connection in connections.get(port, [None]):
+                if connection is None:
+                    rows.append([wire, color, "(not connected)", "", ""])
+                    continue
+                from_pin = _pin_text(harness, connection.from_name, connection.from_pin)
+                to_pin = _pin_text(harness, connection.to_name, connection.to_pin)
+                rows.append([wire, color, from_pin, "->", to_pin])
+        yield from _table(rows)
+        yield ""
+
+    for connector in harness.connectors.values():
+        yield (
+            f"{_title('Connector', connector.name, connector.type)}"
+            f" ({_count(connector.pincount, 'pin')})"
+        )
+        used = [connector.visible_pins.get(pin, False) for pin in connector.pins]
+        yield f"  used:   {_pin_ranges(connector, used, True)}"
+        yield f"  unused: {_pin_ranges(connector, used, False)}"
+        yield ""
+
+    if harness.mates:
+        yield "Mates"
+        rows = []
+        for mate in harness.mates:
+            if isinstance(mate, MatePin):
+                from_pin = _pin_text(harness, mate.from_name, mate.from_pin)
+                to_pin = _pin_text(harness, mate.to_name, mate.to_pin)
+            elif isinstance(mate, MateComponent):
+                from_pin, to_pin = mate.from_name, mate.to_name
+            else:
+                raise Exception(f"{mate} is an unknown mate")
+            rows.append([from_pin, mate.shape, to_pin])
+        yield from _table(rows)
+        yield ""
+
+
+def _count(number: int, noun: str) -> str:
+    return f"{number} {noun}" + ("s" if number != 1 else "")
+
+
+def _title(kind: str, name: str, type: Optional[str]) -> str:
+    type = remove_links(type).replace("\n", " ") if type else ""
+    return f"{kind} {name}" + (f": {type}" if type else "")
+
+
+def _pin_text(harness: "Harness", name: Optional[str], pin: Optional[Pin]) -> str:
+    if name is None:
+        return "(none)"
+    connector = harness.connectors[name]
+    if connector.style == "simple":
+        return name
+    text = f"{name}:{pin}"
+    pin_index = harness._pin_indices(name)[0].get(pin)
+    if pin_index is not None and pin_index < len(connector.pinlabels):
+        if connector.pinlabels[pin_index]:
+            text += f" ({connector.pinlabels[pin_index]})"
+    return text
+
+
+def _pin_ranges(connector: Connector, used: List[bool], state: bool) -> str:
+    """Return the pins with the given state, with runs of 3+ consecutive numbers as ranges."""
+    ranges = []
+    start = None
+    for index, pin_used in enumerate([*used, not state]):  # sentinel ends last run
+        if pin_used == state and start is None:
+            start = index
+        elif pin_used != state and start is not None:
+            pins = connector.pins[start:index]
+            numbered = all(isinstance(pin, int) for pin in pins)
+            if (
+                len(pins) > 2
+                and numbered
+                and pins == list(range(pins[0], pins[0] + len(pins)))
+            ):
+                ranges.append(f"{pins[0]}-{pins[-1]}")
+            else:
+                ranges.extend(str(pin) for pin in pins)
+            start = None
+    return ", ".join(ranges) if ranges else "-"
+
+
+def _table(rows: List[List[str]]) -> Iterator[str]:
+    """Yield the rows with columns padded to equal width, indented."""
+    if not rows:
+        return
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        cells = [cell.ljust(width) for cell, width in zip(row, widths)]
+        yield f"  {'  '.join(cells).rstrip()}"
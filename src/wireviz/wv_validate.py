@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+from collections import Counter
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Sequence
+
+from wireviz.DataClasses import Connection, MateComponent, MatePin, Side
+
+if TYPE_CHECKING:
+    from wireviz.Harness import Harness
+
+
+class Severity(IntEnum):
+    INFO = 1
+    WARNING = 2
+    ERROR = 3
+
+
+@dataclass
+class Finding:
+    severity: Severity
+    rule: str
+    message: str
+    designator: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"{self.severity.name.capitalize()}: {self.message}"
+
+    def as_dict(self) -> Dict[str, Optional[str]]:
+        """Return the finding as a dict of strings, e.g. for JSON output."""
+        return {
+            "severity": self.severity.name.lower(),
+            "rule": self.rule,
+            "message": self.message,
+            "designator": self.designator,
+        }
+
+
+class ValidationIndex:
+    """Connection data of a harness, indexed once for all rules."""
+
+    def __init__(self, harness: "Harness", unused_templates: Sequence[str] = ()):
+        self.harness = harness
+        self.unused_templates = list(unused_templates)
+        # (connector, pin, side) -> list of (cable, wire) attached there
+        self.pin_wires: Dict[tuple, List[tuple]] = {}
+        # (cable, wire) -> list of its connections
+        self.wire_connections: Dict[tuple, List[Connection]] = {}
+        self.connection_count: Counter = Counter()
+        for cable in harness.cables.values():
+            for connection in cable.connections:
+                wire = (cable.name, connection.via_port)
+                self.wire_connections.setdefault(wire, []).append(connection)
+                self.connection_count[(cable.name, *_key(connection))] += 1
+                if connection.from_name is not None:
+                    self.pin_wires.setdefault(
+                        (connection.from_name, connection.from_pin, Side.RIGHT), []
+                    ).append(wire)
+                if connection.to_name is not None:
+                    self.pin_wires.setdefault(
+                        (connection.to_name, connection.to_pin, Side.LEFT), []
+                    ).append(wire)
+
+
+Rule = Callable[[ValidationIndex], Iterator[Finding]]
+RULES: Dict[str, Rule] = {}
+
+
+def rule(name: str) -> Callable[[Rule], Rule]:
+    """Register a validation rule under the given name."""
+
+    def register(function: Rule) -> Rule:
+        RULES[name] = function
+        return function
+
+    return register
+
+
+def validate(harness: "Harness", unused_templates: Sequence[str] = ()) -> List[Finding]:
+    """Return the findings of all rules, most severe first.
+
+    The connections are indexed in one pass, and each rule then runs over
+    the index, so that all problems are reported together.
+    """
+    index = ValidationIndex(harness, unused_templates)
+    findings = [finding for check in RULES.values() for finding in check(index)]
+    return sorted(findings, key=lambda finding: -finding.severity)
+
+
+@rule("pin-multiple-wires")
+def _pin_multiple_wires(index: ValidationIndex) -> Iterator[Finding]:
+    for (name, pin, side), wires in index.pin_wires.items():
+        if index.harness.connectors[name].style == "simple":
+            continue  # ferrules and splices join several wires by design
+        distinct = list(dict.fromkeys(wires))
+        if len(distinct) > 1:
+            wires_str = ", ".join(f"{cable}:{wire}" for cable, wire in distinct)
+            # shields are commonly joined to a wire at a drain or ground pin
+            conductors = [wire for _, wire in distinct if wire != "s"]
+            yield Finding(
+                Severity.WARNING if len(conductors) > 1 else Severity.INFO,
+                "pin-multiple-wires",
+                f"{name}:{pin} is connected to {len(distinct)} wires on its "
+                f"{side.name.lower()} side ({wires_str})",
+                name,
+            )
+
+
+@rule("wire-duplicate")
+def _wire_duplicate(index: ValidationIndex) -> Iterator[Finding]:
+    for (cable, *key), count in index.connection_count.items():
+        if count > 1:
+            from_name, from_pin, wire, to_name, to_pin = key
+            yield Finding(
+                Severity.WARNING,
+                "wire-duplicate",
+                f"{cable}:{wire} is connected from {_end(from_name, from_pin)} "
+                f"to {_end(to_name, to_pin)} {count} times",
+                cable,
+            )
+
+
+@rule("wire-multiple-ends")
+def _wire_multiple_ends(index: ValidationIndex) -> Iterator[Finding]:
+    for (cable, wire), connections in index.wire_connections.items():
+        for side in ("from", "to"):
+            ends = {
+                (getattr(c, f"{side}_name"), getattr(c, f"{side}_pin"))
+                for c in connections
+                if getattr(c, f"{side}_name") is not None
+            }
+            if len(ends) > 1:
+                ends_str = ", ".join(sorted(_end(*end) for end in ends))
+                yield Finding(
+                    Severity.ERROR,
+                    "wire-multiple-ends",
+                    f"{cable}:{wire} has {len(ends)} {side} ends ({ends_str})",
+                    cable,
+                )
+
+
+@rule("wire-dangling")
+def _wire_dangling(index: ValidationIndex) -> Iterator[Finding]:
+    for (cable, wire), connections in index.wire_connections.items():
+        from_ends = any(c.from_name is not None for c in connections)
+        to_ends = any(c.to_name is not None for c in connections)
+        if from_ends != to_ends:
+            side = "to" if from_ends else "from"
+            yield Finding(
+                Severity.INFO,
+                "wire-dangling",
+                f"{cable}:{wire} has no {side} end",
+                cable,
+            )
+
+
+@rule("wire-unconnected")
+def _wire_unconnected(index: ValidationIndex) -> Iterator[Finding]:
+    for cable in index.harness.cables.values():
+        if not cable.connections:
+            continue  # reported as unused cable
+        for wire in range(1, cable.wirecount + 1):
+            if (cable.name, wire) not in index.wire_connections:
+                yield Finding(
+                    Severity.INFO,
+                    "wire-unconnected",
+                    f"{cable.name}:{wire} is not connected",
+                    cable.name,
+                )
+
+
+@rule("component-unused")
+def _component_unused(index: ValidationIndex) -> Iterator[Finding]:
+    mated = set()
+    for mate in index.harness.mates:
+        mated.update((mate.from_name, mate.to_name))
+    used = {name for name, _, _ in index.pin_wires} | mated
+    for cable in index.harness.cables.values():
+        if not cable.connections:
+            yield Finding(
+                Severity.WARNING,
+                "component-unused",
+                f"Cable {cable.name} has no connections",
+                cable.name,
+            )
+    for connector in index.harness.connectors.values():
+        if connector.name not in used:
+            yield Finding(
+                Severity.INFO,
+                "component-unused",
+                f"Connector {connector.name} has no connections or mates",
+                connector.name,
+            )
+    if index.unused_templates:
+        yield Finding(
+            Severity.WARNING,
+            "template-unused",
+            "The following components are not referenced in any connection set: "
+            + ", ".join(index.unused_templates),
+        )
+
+
+@rule("mate-unknown")
+def _mate_unknown(index: ValidationIndex) -> Iterator[Finding]:
+    connectors = index.harness.connectors
+    for mate in index.harness.mates:
+        for name in (mate.from_name, mate.to_name):
+            if name not in connectors:
+                yield Finding(
+                    Severity.ERROR,
+                    "mate-unknown",
+                    f"Mate {mate.from_name} {mate.shape} {mate.to_name} "
+                    f"refers to unknown connector {name}",
+                    name,
+                )
+        if isinstance(mate, MatePin):
+            for name, pin in (
+                (mate.from_name, mate.from_pin),
+                (mate.to_name, mate.to_pin),
+            ):
+                if name in connectors and pin not in connectors[name].pins:
+                    yield Finding(
+                        Severity.ERROR,
+                        "mate-unknown",
+                        f"Mate {mate.from_name}:{mate.from_pin} {mate.shape} "
+                        f"{mate.to_name}:{mate.to_pin} refers to unknown pin {name}:{pin}",
+                        name,
+                    )
+        elif isinstance(mate, MateComponent) and all(
+            name in connectors for name in (mate.from_name, mate.to_name)
+        ):
+            if connectors[mate.from_name].pincount != connectors[mate.to_name].pincount:
+                yield Finding(
+                    Severity.WARNING,
+                    "mate-pincount",
+                    f"Mated connectors {mate.from_name} and {mate.to_name} "
+                    "have different pin counts",
+                    mate.from_name,
+                )
+
+
+@rule("pinlabel-duplicate")
+def _pinlabel_duplicate(index: ValidationIndex) -> Iterator[Finding]:
+    for connector in index.harness.connectors.values():
+        counts = Counter(label for label in connector.pinlabels if label)
+        for label, count in counts.items():
+            if count > 1:
+                yield Finding(
+                    Severity.INFO,
+                    "pinlabel-duplicate",
+                    f"{connector.name} has {count} pins labeled {label}, "
+                    "which can not be referenced by label",
+                    connector.name,
+                )
+
+
+def _key(connection: Connection) -> tuple:
+    return (
+        connection.from_name,
+        connection.from_pin,
+        connection.via_port,
+        connection.to_name,
+        connection.to_pin,
+    )
+
+
+def _end(name: Optional[str], pin) -> str:
+    return "(none)" if name is None else f"{name}:{pin}"
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+import csv
+from typing import TYPE_CHECKING, Iterator, List, Optional, TextIO
+
+from wireviz.DataClasses import Pin
+from wireviz.wv_colors import translate_color
+
+if TYPE_CHECKING:
+    from wireviz.Harness import Harness
+
+WIRE_LIST_HEADER = [
+    "Cable",
+    "Wire",
+    "Color",
+    "Gauge",
+    "Length",
+    "From",
+    "From Pin",
+    "From Label",
+    "To",
+    "To Pin",
+    "To Label",
+]
+
+
+def wire_list_rows(harness: "Harness") -> Iterator[List[str]]:
+    """Yield the header and one from/to row per connection of a cable wire."""
+    yield WIRE_LIST_HEADER
+    mode = harness.options.color_mode
+    for cable in harness.cables.values():
+        gauge = _value_unit(cable.gauge, cable.gauge_unit)
+        length = _value_unit(cable.length, cable.length_unit)
+        for connection in cable.connections:
+            port = connection.via_port
+            if port == "s":
+                wire, color = "Shield", ""
+            else:
+                wire = str(port)
+                color = translate_color(cable.colors[port - 1], mode)
+            yield [
+                cable.name,
+                wire,
+                color,
+                gauge,
+                length,
+                *_pin_cells(harness, connection.from_name, connection.from_pin),
+                *_pin_cells(harness, connection.to_name, connection.to_pin),
+            ]
+
+
+def write_wire_list_tsv(file: TextIO, harness: "Harness") -> None:
+    """Write the wire list to file as tab-separated text, one row at a time."""
+    writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+    writer.writerows(wire_list_rows(harness))
+
+
+def _value_unit(value: Optional[float], unit: Optional[str]) -> str:
+    if not value:
+        return ""
+    return f"{value} {unit}" if unit else str(value)
+
+
+def _pin_cells(harness: "Harness", name: Optional[str], pin: Optional[Pin]) -> List:
+    """Return the connector, pin and pin label cells of one end of a wire."""
+    if name is None:
+        return ["", "", ""]
+    connector = harness.connectors[name]
+    if connector.style == "simple":
+        return [name, "", ""]
+    label = ""
+    pin_index = harness._pin_indices(name)[0].get(pin)
+    if pin_index is not None and pin_index < len(connector.pinlabels):
+        label = connector.pinlabels[pin_index] or ""
+    return [name, pin, label]
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+
+try:  # CParser is only available when PyYAML is built with libyaml
+    from yaml.cyaml import CParser, CSafeLoader
+except ImportError:
+    StreamingLoader = yaml.SafeLoader
+    SafeLoader = yaml.SafeLoader
+else:
+
+    class StreamingLoader(CParser, Composer, SafeConstructor, Resolver):
+        """Safe loader using the libyaml event parser, able to compose single nodes."""
+
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+    SafeLoader = CSafeLoader
+
+YAMLSource = Union[str, Path]  # YAML text, or path to a YAML file
+
+# keys of the single-key objects that stand for values JSON can not express
+CACHE_TAGS = ("__items__", "__datetime__", "__date__", "__bytes__", "__set__")
+
+
+def load_yaml(yaml_str: str, cache_dir: Union[str, Path, None] = None) -> Any:
+    """Return the parsed YAML data, using the fastest available safe loader.
+
+    With a cache directory, the data is stored there as JSON, keyed by a hash
+    of the YAML text, and loaded from there when the same text is seen again.
+    The cache only holds data, so reading it can not run any code.
+    """
+    if not cache_dir:
+        return yaml.load(yaml_str, Loader=SafeLoader)
+
+    digest = hashlib.sha256(yaml_str.encode("utf-8")).hexdigest()
+    cache_file = Path(cache_dir) / f"{digest}.json"
+    try:
+        with cache_file.open("r", encoding="utf-8") as file:
+            return json.load(file, object_hook=_from_json)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable YAML cache file {cache_file}: {e}")
+
+    yaml_data = yaml.load(yaml_str, Loader=SafeLoader)
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # write to a temporary file first, to never leave a partial cache file behind
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with tmp_file.open("w", encoding="utf-8") as file:
+        json.dump(_to_json(yaml_data), file, ensure_ascii=False, separators=(",", ":"))
+    tmp_file.replace(cache_file)
+    return yaml_data
+
+
+def _to_json(value: Any) -> Any:
+    """Return YAML data as JSON-compatible data, tagging what JSON can not express."""
+    if isinstance(value, dict):
+        if all(isinstance(key, str) and key not in CACHE_TAGS for key in value):
+            return {key: _to_json(v) for key, v in value.items()}
+        # e.g. pin numbers as keys
+        return {"__items__": [[_to_json(k), _to_json(v)] for k, v in value.items()]}
+    if isinstance(value, list):
+        return [_to_json(v) for v in value]
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, bytes):  # !!binary
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, set):  # !!set
+        return {"__set__": [_to_json(v) for v in value]}
+    return value
+
+
+def _from_json(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1:
+        tag, value = next(iter(obj.items()))
+        if tag == "__items__":
+            return {k: v for k, v in value}
+        if tag == "__datetime__":
+            return datetime.fromisoformat(value)
+        if tag == "__date__":
+            return date.fromisoformat(value)
+        if tag == "__bytes__":
+            return base64.b64decode(value)
+        if tag == "__set__":
+            return set(value)
+    return obj
+
+
+def load_yaml_sections(source: YAMLSource, streamed_key: str) -> Any:
+    """Return the top-level YAML mapping without the value of streamed_key.
+
+    The events of the skipped value are consumed without building any nodes
+    except those with an anchor, so memory use does not depend on its size,
+    and aliases to these anchors in later sections still resolve.
+    Use iter_yaml_sequence() to read the skipped value afterwards.
+    """
+    with _streaming_loader(source) as loader:
+        if not _start_top_level_mapping(loader):
+            # not a mapping; return as-is to let the caller report it
+            return _construct_next(loader)
+        sections = {}
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_next(loader)
+            if key == streamed_key:
+                _skip_node(loader)
+            else:
+                sections[key] = _construct_next(loader)
+        return sections
+
+
+def iter_yaml_sequence(source: YAMLSource, streamed_key: str) -> Iterator[Any]:
+    """Yield the items of the top-level sequence streamed_key one at a time.
+
+    Nothing is yielded if streamed_key is missing or is not a sequence.
+    """
+    with _streaming_loader(source) as loader:
+        if not _start_top_level_mapping(loader):
+            return
+        while not loader.check_event(yaml.MappingEndEvent):
+            key = _construct_next(loader)
+            if key != streamed_key or not loader.check_event(yaml.SequenceStartEvent):
+                # compose and discard, to register any anchors defined here
+                loader.compose_node(None, None)
+                continue
+            loader.get_event()
+            while not loader.check_event(yaml.SequenceEndEvent):
+                yield _construct_next(loader)
+            loader.get_event()
+
+
+@contextmanager
+def _streaming_loader(source: YAMLSource) -> Iterator[StreamingLoader]:
+    if isinstance(source, Path):
+        with source.open("r", encoding="utf-8") as file:
+            loader = StreamingLoader(file)
+            try:
+                yield loader
+            finally:
+                loader.dispose()
+    else:
+        loader = StreamingLoader(source)
+        try:
+            yield loader
+        finally:
+            loader.dispose()
+
+
+def _start_top_level_mapping(loader: StreamingLoader) -> bool:
+    """Consume the events leading up to the first top-level mapping key.
+
+    Return False if the document is empty or not a mapping.
+    """
+    loader.get_event()  # StreamStartEvent
+    if loader.check_event(yaml.StreamEndEvent):
+        return False
+    loader.get_event()  # DocumentStartEvent
+    if not loader.check_event(yaml.MappingStartEvent):
+        return False
+    loader.get_event()
+    return True
+
+
+def _construct_next(loader: StreamingLoader) -> Any:
+    """Compose and construct the next node, then forget the constructed objects."""
+    if loader.check_event(yaml.StreamEndEvent):
+        return None
+    node = loader.compose_node(None, None)
+    data = loader.construct_object(node, deep=True)
+    loader.constructed_objects = {}
+    loader.recursive_objects = {}
+    return data
+
+
+def _skip_node(loader: StreamingLoader) -> None:
+    """Consume the events of the next node, composing only nodes with an anchor.
+
+    Composing an anchored node registers it with the loader, like loading
+    the complete document would.
+    """
+    depth = 0
+    while True:
+        event = loader.peek_event()
+        anchored = isinstance(event, (yaml.ScalarEvent, yaml.CollectionStartEvent))
+        if anchored and event.anchor is not None:
+            loader.compose_node(None, None)
+            if depth == 0:
+                return
+            continue
+        loader.get_event()
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return